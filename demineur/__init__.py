@@ -0,0 +1,2 @@
+# démineur : seul le moteur est importé ici, pygame n'est chargé que par demineur.rendering et demineur.assets
+from demineur.engine import BoardState, ChangeSet, Coord, Grid, MineSchemaType, OfficialCarreType, PositiveInt, isChecked, setChecked
@@ -0,0 +1,3 @@
+from demineur.app import main
+
+main()
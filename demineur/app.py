@@ -0,0 +1,363 @@
+# point d'entrée du jeu : boucles de jeu et ligne de commande
+# pygame et les rendus pygame ne sont importés que s'ils sont utilisés
+from typing import List, Optional, TextIO
+import random
+import time
+import sys
+import argparse
+import importlib
+from demineur.engine import BoardState, Coord, FIRST_CLICK_SAFE_MODES, Grid, OfficialCarreType, Point, PositiveInt, setChecked
+from demineur.renderer import Renderer
+
+SCROLL_SPEED = 15
+FPS = 60
+WALL_RESTART_DELAY = 1.0
+
+# nom du rendu : (module, classe), le module n'est importé qu'à la création du rendu
+RENDERERS = {
+    'pygame'    : ('demineur.rendering', 'PygameRenderer'),
+    'texture'   : ('demineur.rendering', 'TextureRenderer'),
+    'terminal'  : ('demineur.renderer', 'TerminalRenderer'),
+    'null'      : ('demineur.renderer', 'NullRenderer'),
+}
+
+def createRenderer(name: str) -> 'Renderer':
+    module, className = RENDERERS[name]
+    return getattr(importlib.import_module(module), className)()
+
+class GameData:
+    _grid       : 'Grid'
+    _renderer   : 'Renderer'
+    _startTime  : Optional[float]
+    _endTime    : Optional[float]
+
+    def __init__(
+            self,
+            gridSize    : 'PositiveInt'                 = 20,
+            mineCount   : 'PositiveInt'                 = 10,
+            renderer    : Optional['Renderer']          = None,
+            width       : Optional['PositiveInt']       = None,
+            height      : Optional['PositiveInt']       = None,
+            seed        : Optional[int]                 = None,
+            rng         : Optional[random.Random]       = None,
+            firstClickSafe: str                         = 'none',
+            grid        : Optional['Grid']              = None
+        ) -> None:
+        # grid : grille déjà générée (demineur.generator), les paramètres de génération sont alors ignorés
+        if grid is None:
+            grid = Grid(size=gridSize, mineCount=mineCount, width=width, height=height, seed=seed, rng=rng, firstClickSafe=firstClickSafe)
+        self._grid      = grid
+        self._renderer  = renderer if renderer is not None else createRenderer(name='pygame')
+        self._startTime = None
+        self._endTime   = None
+        self._renderer.open(state=self._grid.getState())
+
+    def draw(self) -> None:
+        self._renderer.setHud(remainingMineCount=self._grid.getRemainingMineCount(), seconds=self.getSeconds())
+        self._renderer.draw()
+
+    def getSeconds(self) -> int:
+        # le chronomètre part à la première case ouverte et s'arrête en fin de partie
+        if self._startTime is None: return 0
+        endTime = self._endTime if self._endTime is not None else time.monotonic()
+        return int(endTime - self._startTime)
+
+    def close(self) -> None:
+        self._renderer.close()
+
+    def getState(self) -> 'BoardState':
+        return self._grid.getState()
+
+    def getGrid(self) -> 'Grid':
+        return self._grid
+
+    def isOver(self) -> bool:
+        return self._endTime is not None
+
+    def getEndTime(self) -> Optional[float]:
+        return self._endTime
+
+    def centerOnMinimapClick(self, clickPosition:'Point') -> bool:
+        return self._renderer.centerOnMinimapClick(clickPosition=clickPosition)
+
+    def scroll(self, dx: int, dy: int) -> None:
+        self._renderer.scroll(dx=dx, dy=dy)
+
+    def zoom(self, step: int, anchor: 'Point') -> None:
+        self._renderer.zoom(step=step, anchor=anchor)
+
+    def setPointer(self, point: 'Point', isPressed: bool) -> None:
+        self._renderer.setPointer(point=point, isPressed=isPressed)
+
+    def isOnGrid(self, coord: 'Coord') -> bool:
+        return self._grid.contains(coord=coord)
+
+    def isRevealing(self) -> bool:
+        return self._grid.isRevealing()
+
+    def displaySlotByClick(self, clickPosition:'Point') -> None:
+        coord = self._renderer.coordFromScreen(point=clickPosition)
+        if coord is None: return
+
+        self.displaySlotByCoord(coord=coord)
+
+    def displaySlotByCoord(self, coord: 'Coord') -> None:
+        # la grille est figée une fois la partie finie
+        if self.isOver(): return
+
+        if self._startTime is None:
+            self._startTime = time.monotonic()
+        self._grid.displaySlotByCoord(coord=coord)
+
+    def _displayAll(self) -> None:
+        if self._endTime is None:
+            self._endTime = time.monotonic()
+        self._grid.displayAll()
+
+    def toggleFlag(self, clickPosition:'Point') -> None:
+        coord = self._renderer.coordFromScreen(point=clickPosition)
+        if coord is None: return
+
+        self.toggleFlagByCoord(coord=coord)
+
+    def toggleFlagByCoord(self, coord: 'Coord') -> None:
+        if self.isOver(): return
+
+        self._grid.toggleFlag(coord=coord)
+
+    def update(self) -> None:
+        if not self._grid.isRevealing(): return
+
+        self._grid.processReveal()
+        self.displayAllIfWin()
+
+    def displayAllIfWin(self) -> None:
+        # la victoire ne se décide qu'une fois l'ouverture terminée
+        if self._grid.isRevealing(): return
+
+        if not self._grid.haveBlackSlot():
+            self._displayAll()
+
+    def displayAllIfMine(self, clickPosition:'Point') -> None:
+        coord = self._renderer.coordFromScreen(point=clickPosition)
+        if coord is None: return
+
+        self.displayAllIfMineByCoord(coord=coord)
+
+    def displayAllIfMineByCoord(self, coord: 'Coord') -> None:
+        if self.isOver(): return
+
+        if self._grid.isMine(coord=coord):
+            self._grid.exploseMine(coord=coord)
+            self._displayAll()
+
+def printProgress(done: int, total: int) -> None:
+    sys.stderr.write(f"\rchargement des images {done}/{total}" + ("\n" if done == total else ""))
+    sys.stderr.flush()
+
+def pygameLoop(gameData: 'GameData') -> None:
+    import pygame
+    clock = pygame.time.Clock()
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEWHEEL and pygame.key.get_mods() & pygame.KMOD_CTRL:
+                mouse_x, mouse_y = pygame.mouse.get_pos()
+                gameData.zoom(step=event.y, anchor=Point(x=mouse_x, y=mouse_y))
+            elif event.type == pygame.MOUSEWHEEL:
+                gameData.scroll(dx=-event.x * SCROLL_SPEED, dy=-event.y * SCROLL_SPEED)
+            elif event.type == pygame.KEYDOWN and event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS, pygame.K_MINUS, pygame.K_KP_MINUS):
+                mouse_x, mouse_y = pygame.mouse.get_pos()
+                step = -1 if event.key in (pygame.K_MINUS, pygame.K_KP_MINUS) else 1
+                gameData.zoom(step=step, anchor=Point(x=mouse_x, y=mouse_y))
+            elif event.type == pygame.MOUSEMOTION and event.buttons[1]: # middle drag
+                gameData.scroll(dx=-event.rel[0], dy=-event.rel[1])
+            elif event.type == pygame.MOUSEBUTTONUP:
+
+                mouse_x, mouse_y = pygame.mouse.get_pos()
+                clickPosition = Point(x=mouse_x, y=mouse_y)
+
+                if event.button == 1 and gameData.centerOnMinimapClick(clickPosition=clickPosition):
+                    pass
+                elif event.button == 1: # left click
+                    gameData.displaySlotByClick(clickPosition=clickPosition)
+
+                if event.button == 3: # right click
+                    gameData.toggleFlag(clickPosition=clickPosition)
+
+                gameData.displayAllIfMine(clickPosition=clickPosition)
+                gameData.displayAllIfWin()
+
+        # défilement au clavier
+        keys = pygame.key.get_pressed()
+        gameData.scroll(
+            dx=(keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * SCROLL_SPEED,
+            dy=(keys[pygame.K_DOWN] - keys[pygame.K_UP]) * SCROLL_SPEED,
+        )
+
+        # surbrillance : une seule fois par image, quel que soit le nombre de MOUSEMOTION reçus
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        gameData.setPointer(point=Point(x=mouse_x, y=mouse_y), isPressed=pygame.mouse.get_pressed()[0])
+
+        # ouverture en cours, étalée sur plusieurs images
+        gameData.update()
+
+        # Mettre à jour l'affichage
+        gameData.draw()
+        clock.tick(FPS)
+
+def randomMove(gameData: 'GameData', rng: random.Random) -> None:
+    # joueur automatique naïf : ouvre une case encore noire tirée au hasard
+    state = gameData.getState()
+    coord = Coord(coordX=PositiveInt(rng.randrange(state.getWidth())), coordY=PositiveInt(rng.randrange(state.getHeight())))
+    if state.get(coord=coord) != OfficialCarreType.BLACK: return
+
+    gameData.displaySlotByCoord(coord=coord)
+    gameData.displayAllIfMineByCoord(coord=coord)
+    gameData.displayAllIfWin()
+
+def wallLoop(gridSize: 'PositiveInt', mineCount: 'PositiveInt', gameCount: 'PositiveInt') -> None:
+    # parties de robots affichées en miniatures, relancées peu après leur fin
+    import pygame
+    from demineur.rendering import ThumbnailWall
+    clock   = pygame.time.Clock()
+    rng     = random.Random()
+    games   = [GameData(gridSize=gridSize, mineCount=mineCount, renderer=Renderer()) for _ in range(gameCount)]
+    wall    = ThumbnailWall(states=[game.getState() for game in games])
+    wall.open()
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        now = time.monotonic()
+        for index, game in enumerate(games):
+            if game.isOver():
+                if now - game.getEndTime() > WALL_RESTART_DELAY:
+                    games[index] = GameData(gridSize=gridSize, mineCount=mineCount, renderer=Renderer())
+                    wall.setState(index=index, state=games[index].getState())
+                continue
+            if not game.isRevealing():
+                randomMove(gameData=game, rng=rng)
+            game.update()
+
+        wall.draw()
+        clock.tick(FPS)
+
+def commandLoop(gameData: 'GameData', stream: TextIO = sys.stdin) -> None:
+    # sans fenêtre : "r x y" ouvre une case, "f x y" pose ou retire un drapeau, "q" quitte
+    gameData.draw()
+    for line in stream:
+        command = line.split()
+        if command == ['q']: break
+        if len(command) != 3 or command[0] not in ('r', 'f') or not (command[1].isdigit() and command[2].isdigit()):
+            continue
+
+        coord = Coord(coordX=PositiveInt(int(command[1])), coordY=PositiveInt(int(command[2])))
+        if not gameData.isOnGrid(coord=coord): continue
+
+        if command[0] == 'r':
+            gameData.displaySlotByCoord(coord=coord)
+        else:
+            gameData.toggleFlagByCoord(coord=coord)
+        gameData.displayAllIfMineByCoord(coord=coord)
+        gameData.displayAllIfWin()
+
+        gameData.draw()
+        while gameData.isRevealing():
+            gameData.update()
+            gameData.draw()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Démineur")
+    parser.add_argument('--renderer', choices=sorted(RENDERERS), default='pygame')
+    parser.add_argument('--size', type=int, default=20)
+    parser.add_argument('--mines', type=int, default=60)
+    parser.add_argument('--width', type=int, help="largeur de la grille, --size par défaut")
+    parser.add_argument('--height', type=int, help="hauteur de la grille, --size par défaut")
+    parser.add_argument('--seed', type=int, help="graine de génération, pour rejouer une grille")
+    parser.add_argument('--safe', choices=FIRST_CLICK_SAFE_MODES, default='none', help="protection du premier clic")
+    parser.add_argument('--no-guess', action='store_true', help="grille résoluble sans deviner, la case de départ est ouverte")
+    parser.add_argument('--3bv', dest='bbbv', type=int, nargs=2, metavar=('MIN', 'MAX'), help="grille dont le 3BV (clics minimum) est entre MIN et MAX")
+    parser.add_argument('--workers', type=int, default=1, help="processus de recherche pour --3bv")
+    parser.add_argument('--wall', type=int, default=0, help="nombre de parties de robots à suivre en miniatures")
+    parser.add_argument('--record', metavar='DIRECTORY', help="enregistrer les images de la partie dans ce dossier")
+    parser.add_argument('--record-format', choices=('png', 'delta'), default='png')
+    parser.add_argument('--build-sprites', action='store_true', help="reconstruire la planche de sprites depuis les images sources")
+    parser.add_argument('--unchecked', action='store_true', help="mode rapide : pas de vérification des valeurs internes")
+    args = parser.parse_args(argv)
+
+    if args.unchecked:
+        setChecked(checked=False)
+
+    isPygame = args.wall > 0 or args.build_sprites or args.record or args.renderer in ('pygame', 'texture')
+    if isPygame:
+        import pygame
+        from demineur.assets import ASSET_LOADER
+        from demineur.rendering import FrameRecorder
+
+    if args.build_sprites:
+        print(ASSET_LOADER.buildSpriteSheet())
+        return
+
+    if args.wall > 0:
+        pygame.init()
+        wallLoop(gridSize=PositiveInt(args.size), mineCount=PositiveInt(args.mines), gameCount=PositiveInt(args.wall))
+        pygame.quit()
+        return
+
+    # Initialiser Pygame
+    if args.renderer in ('pygame', 'texture'):
+        pygame.init()
+        ASSET_LOADER.preload(progress=printProgress)
+
+    # initier une grille
+    gridSize    = PositiveInt(args.size)
+    mineCount   = PositiveInt(args.mines)
+    renderer    = createRenderer(name=args.renderer)
+    recorder    = FrameRecorder(directory=args.record, format=args.record_format) if args.record else None
+    renderer.setRecorder(recorder=recorder)
+    report      = None
+    width       = args.width if args.width is not None else gridSize
+    height      = args.height if args.height is not None else gridSize
+    if args.bbbv:
+        from demineur.generator import generateByDifficulty
+        report  = generateByDifficulty(
+            width=width, height=height, mineCount=mineCount, low=args.bbbv[0], high=args.bbbv[1],
+            noGuess=args.no_guess, seed=args.seed, workers=args.workers,
+        )
+    elif args.no_guess:
+        from demineur.generator import generateNoGuess
+        report  = generateNoGuess(width=width, height=height, mineCount=mineCount, seed=args.seed)
+    gameData    = GameData(
+        gridSize=gridSize, mineCount=mineCount, renderer=renderer, width=args.width, height=args.height, seed=args.seed,
+        firstClickSafe=args.safe, grid=report.getGrid() if report is not None else None,
+    )
+    grid        = gameData.getGrid()
+    sys.stderr.write(f"grille {grid.getState().getWidth()}x{grid.getState().getHeight()}, {mineCount} mines, graine {grid.getSeed()}, {grid.getAlgorithm()}\n")
+    if report is not None:
+        bbbv = f", 3BV {report.get3BV()}" if report.get3BV() is not None else ""
+        sys.stderr.write(f"générée en {report.getSeconds() * 1000:.1f} ms, {report.getAttempts()} essais, {report.getBoards()} tirages{bbbv}\n")
+    if report is not None and report.getStart() is not None:
+        # le chronomètre ne part qu'au premier clic du joueur
+        grid.displaySlotByCoord(coord=report.getStart())
+        grid.finishReveal()
+
+    if args.renderer in ('pygame', 'texture'):
+        pygameLoop(gameData=gameData)
+    else:
+        commandLoop(gameData=gameData)
+
+    # Quitter
+    try:
+        if recorder is not None:
+            recorder.close()
+    finally:
+        gameData.close()
+        if args.renderer in ('pygame', 'texture'):
+            pygame.quit()
@@ -0,0 +1,268 @@
+# chargement des images des cases
+import pygame
+from typing import List, Dict, Optional, Tuple, Any, Callable
+from collections import OrderedDict
+from pygame.surface import Surface
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import threading
+import struct
+import zlib
+import json
+import hashlib
+from demineur.engine import OfficialCarreType, PositiveInt
+
+CARRE_SIZE = 30
+ZOOM_LEVELS = (1, 2, 4, 6, 8, 12, 16, 20, 24, 30, 40, 50, 60)
+TILE_SET_CACHE_SIZE = 4
+ASSET_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+SPRITE_SHEET_NAME = 'sprites'
+SPRITE_SHEET_CARRE_SIZE = max(ZOOM_LEVELS)
+ASSET_CACHE_DIRECTORY = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'demineur')
+
+class AssetCache:
+    # images déjà redimensionnées, gardées sur disque d'un lancement à l'autre
+    # clé : empreinte du fichier source et taille de carré, l'empreinte n'est recalculée
+    # que si la date de modification ou la taille du fichier source ont changé
+    # fichier : '<HH' (largeur, hauteur) puis les octets RGBA compressés avec zlib
+
+    _directory      : str
+    _index          : Optional[Dict[str, List[Any]]]
+    _lock           : 'threading.Lock'
+
+    def __init__(self, directory: str) -> None:
+        # l'index n'est lu qu'à la première image demandée
+        # le verrou protège l'index quand les images sont préparées par plusieurs threads
+        self._directory = directory
+        self._index     = None
+        self._lock      = threading.Lock()
+
+    def _loadIndex(self) -> Dict[str, List[Any]]:
+        with self._lock:
+            if self._index is None:
+                try:
+                    with open(os.path.join(self._directory, 'index.json')) as stream:
+                        self._index = json.load(stream)
+                except (OSError, ValueError):
+                    self._index = {}
+            return self._index
+
+    def get(self, path: str, carreSize: 'PositiveInt', scale: Callable[[], 'Surface']) -> 'Surface':
+        tilePath = os.path.join(self._directory, f"{self._digest(path=path)}-{carreSize}.tile")
+        try:
+            with open(tilePath, 'rb') as stream:
+                width, height = struct.unpack('<HH', stream.read(4))
+                return pygame.image.fromstring(zlib.decompress(stream.read()), (width, height), 'RGBA')
+        except (OSError, struct.error, zlib.error, ValueError):
+            pass
+
+        picture = scale()
+        # un cache en lecture seule ou plein ne doit pas empêcher de jouer
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(tilePath + '.tmp', 'wb') as stream:
+                stream.write(struct.pack('<HH', picture.get_width(), picture.get_height()))
+                stream.write(zlib.compress(pygame.image.tostring(picture, 'RGBA')))
+            os.replace(tilePath + '.tmp', tilePath)
+        except OSError:
+            pass
+        return picture
+
+    def _digest(self, path: str) -> str:
+        status  = os.stat(path)
+        key     = os.path.abspath(path)
+        entry   = self._loadIndex().get(key)
+        if entry is not None and entry[:2] == [status.st_mtime_ns, status.st_size]:
+            return entry[2]
+
+        with open(path, 'rb') as stream:
+            digest = hashlib.sha1(stream.read()).hexdigest()
+        with self._lock:
+            self._index[key] = [status.st_mtime_ns, status.st_size, digest]
+            try:
+                os.makedirs(self._directory, exist_ok=True)
+                with open(os.path.join(self._directory, 'index.json.tmp'), 'w') as stream:
+                    json.dump(self._index, stream)
+                os.replace(os.path.join(self._directory, 'index.json.tmp'), os.path.join(self._directory, 'index.json'))
+            except OSError:
+                pass
+        return digest
+
+def scalePicture(picture: 'Surface', carreSize: 'PositiveInt') -> 'Surface':
+    # Redimensionner l'image pour qu'elle entre dans le carré
+    if picture.get_width() > picture.get_height():
+        scale = carreSize / picture.get_width()
+    else:
+        scale = carreSize / picture.get_height()
+    return pygame.transform.scale(picture, (int(picture.get_width() * scale), int(picture.get_height() * scale)))
+
+class OfficialPicture():
+    # image source d'un type, utilisée quand la planche de sprites n'existe pas ou pour la construire
+    # l'image source n'est décodée que si la taille demandée n'est pas dans le cache
+
+    _path       : Optional[str]
+    _original   : Optional['Surface']
+    _cache      : 'AssetCache'
+
+    def __init__(self, type:'OfficialCarreType', cache: 'AssetCache', directory: str = ASSET_DIRECTORY) -> None:
+        self._cache = cache
+
+        specialPictureDict = {
+            OfficialCarreType.MINE: "mine.png",
+            OfficialCarreType.FLAG: "flag.png",
+            OfficialCarreType.MINE_EXPLOSED: "mineExplosed.png",
+        }
+
+        self._original = None
+        if type in specialPictureDict:
+            self._path = os.path.join(directory, specialPictureDict[type])
+        elif type in range(9):
+            self._path = os.path.join(directory, f"{type}.png")
+        else:
+            self._path = None
+
+    def getPicture(self, carreSize: 'PositiveInt') -> Optional['Surface']:
+        if self._path is None: return None
+        return self._cache.get(path=self._path, carreSize=carreSize, scale=lambda: self._scale(carreSize=carreSize))
+
+    def _scale(self, carreSize: 'PositiveInt') -> 'Surface':
+        if self._original is None:
+            self._original = pygame.image.load(self._path)
+        return scalePicture(picture=self._original, carreSize=carreSize)
+
+class AssetLoader:
+    # aucune image n'est lue à l'import : chaque type est chargé à sa première demande
+    # preload() permet de tout charger avant d'ouvrir la fenêtre
+    # les images viennent de la planche de sprites placée à côté du module (une lecture, découpée avec subsurface)
+    # et à défaut des images sources une par une
+
+    _cache      : 'AssetCache'
+    _directory  : str
+    _sprites    : Optional[Dict[int, 'Surface']]
+    _pictures   : Dict['OfficialCarreType', 'OfficialPicture']
+
+    def __init__(self, cacheDirectory: str, directory: str = ASSET_DIRECTORY) -> None:
+        self._cache     = AssetCache(directory=cacheDirectory)
+        self._directory = directory
+        self._sprites   = None
+        self._pictures  = {}
+
+    def getPicture(self, type: 'OfficialCarreType', carreSize: 'PositiveInt') -> Optional['Surface']:
+        sprites = self._loadSprites()
+        if sprites:
+            sprite = sprites.get(type)
+            if sprite is None: return None
+            return sprite if sprite.get_width() == carreSize or sprite.get_height() == carreSize else scalePicture(picture=sprite, carreSize=carreSize)
+
+        return self._getOfficialPicture(type=type).getPicture(carreSize=carreSize)
+
+    def _getOfficialPicture(self, type: 'OfficialCarreType') -> 'OfficialPicture':
+        if type not in self._pictures:
+            self._pictures[type] = OfficialPicture(type, cache=self._cache, directory=self._directory)
+        return self._pictures[type]
+
+    def _loadSprites(self) -> Dict[int, 'Surface']:
+        # planche absente ou illisible : dictionnaire vide, les images sources sont utilisées
+        if self._sprites is None:
+            try:
+                with open(os.path.join(self._directory, f"{SPRITE_SHEET_NAME}.json")) as stream:
+                    index = json.load(stream)
+                sheet           = pygame.image.load(os.path.join(self._directory, f"{SPRITE_SHEET_NAME}.png"))
+                self._sprites   = {int(officialType): sheet.subsurface(rect) for officialType, rect in index['sprites'].items()}
+            except (OSError, ValueError, KeyError, pygame.error):
+                self._sprites = {}
+        return self._sprites
+
+    def buildSpriteSheet(self, carreSize: 'PositiveInt' = SPRITE_SHEET_CARRE_SIZE) -> str:
+        # planche : une ligne de cases de carreSize, index json des rectangles par type
+        officialTypes = range(OfficialCarreType.BLACK, 9)
+        with ThreadPoolExecutor() as executor:
+            scaled = executor.map(lambda officialType: self._getOfficialPicture(type=officialType).getPicture(carreSize=carreSize), officialTypes)
+            pictures = {officialType: picture for officialType, picture in zip(officialTypes, scaled) if picture is not None}
+
+        sheet   = Surface((len(pictures) * carreSize, carreSize), pygame.SRCALPHA)
+        rects   = {}
+        for count, (officialType, picture) in enumerate(pictures.items()):
+            sheet.blit(picture, (count * carreSize, 0))
+            rects[str(officialType)] = [count * carreSize, 0, picture.get_width(), picture.get_height()]
+
+        path = os.path.join(self._directory, f"{SPRITE_SHEET_NAME}.png")
+        pygame.image.save(sheet, path)
+        with open(os.path.join(self._directory, f"{SPRITE_SHEET_NAME}.json"), 'w') as stream:
+            json.dump({'carreSize': carreSize, 'sprites': rects}, stream, indent=1)
+        self._sprites = None
+        return path
+
+    def preload(
+            self,
+            carreSizes  : Tuple[int, ...]                       = (CARRE_SIZE,),
+            progress    : Optional[Callable[[int, int], None]]  = None,
+            maxWorkers  : Optional[int]                         = None
+        ) -> None:
+        officialTypes = range(OfficialCarreType.BLACK, 9)
+        if self._loadSprites():
+            for carreSize in carreSizes:
+                tileSet = TILE_SET_CACHE.get(carreSize=PositiveInt(carreSize))
+                for officialType in officialTypes:
+                    tileSet.getPicture(type=officialType)
+            return
+
+        # sans planche : les images sources sont décodées et redimensionnées en parallèle,
+        # pygame relâche le GIL pendant le décodage, tout est joint avant la première image
+        pictures = {officialType: self._getOfficialPicture(type=officialType) for officialType in officialTypes}
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            futures = {
+                executor.submit(lambda picture: [picture.getPicture(carreSize=PositiveInt(carreSize)) for carreSize in carreSizes], picture): officialType
+                for officialType, picture in pictures.items()
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                for carreSize, scaled in zip(carreSizes, future.result()):
+                    TILE_SET_CACHE.get(carreSize=PositiveInt(carreSize)).setPicture(type=futures[future], picture=scaled)
+                if progress is not None:
+                    progress(done, len(futures))
+
+ASSET_LOADER = AssetLoader(cacheDirectory=ASSET_CACHE_DIRECTORY)
+
+class TileSet:
+    # images redimensionnées pour une taille de carré, demandées à ASSET_LOADER au premier dessin de chaque type
+
+    _carreSize  : 'PositiveInt'
+    _value      : Dict['OfficialCarreType', Optional['Surface']]
+
+    def __init__(self, carreSize: 'PositiveInt') -> None:
+        self._carreSize = carreSize
+        self._value     = {}
+
+    def getCarreSize(self) -> 'PositiveInt':
+        return self._carreSize
+
+    def getPicture(self, type: 'OfficialCarreType') -> Optional['Surface']:
+        if type not in self._value:
+            self._value[type] = ASSET_LOADER.getPicture(type=type, carreSize=self._carreSize)
+        return self._value[type]
+
+    def setPicture(self, type: 'OfficialCarreType', picture: Optional['Surface']) -> None:
+        self._value[type] = picture
+
+class TileSetCache:
+    # un TileSet par niveau de zoom, les moins récemment utilisés sont évincés
+
+    _capacity   : 'PositiveInt'
+    _value      : 'OrderedDict[PositiveInt, TileSet]'
+
+    def __init__(self, capacity: 'PositiveInt') -> None:
+        self._capacity  = capacity
+        self._value     = OrderedDict()
+
+    def get(self, carreSize: 'PositiveInt') -> 'TileSet':
+        if carreSize in self._value:
+            self._value.move_to_end(carreSize)
+            return self._value[carreSize]
+
+        tileSet = TileSet(carreSize=carreSize)
+        self._value[carreSize] = tileSet
+        if len(self._value) > self._capacity:
+            self._value.popitem(last=False)
+        return tileSet
+
+TILE_SET_CACHE = TileSetCache(capacity=PositiveInt(TILE_SET_CACHE_SIZE))
@@ -0,0 +1,81 @@
+# mesures du moteur en mode vérifié et en mode rapide : python -m demineur.bench
+from typing import Callable, List, Optional, Tuple
+import argparse
+import time
+from demineur.engine import Coord, Grid, PositiveInt, setChecked
+
+def _best(function: Callable[[], None], repeat: int) -> float:
+    # meilleur temps sur plusieurs essais, en millisecondes
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+def _generation(size: int, mineCount: int) -> Callable[[], None]:
+    def run() -> None:
+        Grid(size=PositiveInt(size), mineCount=PositiveInt(mineCount), seed=0)
+    return run
+
+def _reveal(size: int) -> Callable[[], None]:
+    # grille sans mine : une seule ouverture découvre toutes les cases
+    def run() -> None:
+        grid = Grid(size=PositiveInt(size), mineCount=PositiveInt(0))
+        grid.displaySlotByCoord(coord=Coord(coordX=0, coordY=0))
+        grid.finishReveal()
+    return run
+
+def _read(size: int) -> Callable[[], None]:
+    grid    = Grid(size=PositiveInt(size), mineCount=PositiveInt(0))
+    state   = grid.getState()
+    coords  = [Coord(coordX=x, coordY=y) for y in range(size) for x in range(size)]
+    def run() -> None:
+        for coord in coords:
+            state.get(coord=coord)
+    return run
+
+def _viewport(size: int) -> Optional[Callable[[], None]]:
+    # le Viewport est dans le module de rendu, qui demande pygame
+    try:
+        from demineur.rendering import Viewport
+    except ImportError:
+        return None
+    viewport    = Viewport(width=PositiveInt(800), height=PositiveInt(800), gridWidth=PositiveInt(size), gridHeight=PositiveInt(size))
+    coords      = [Coord(coordX=x, coordY=y) for y in range(size) for x in range(size)]
+    def run() -> None:
+        for coord in coords:
+            viewport.carrePosition(coord=coord)
+    return run
+
+def run(size: int, mineCount: int, repeat: int) -> List[Tuple[str, float, float]]:
+    benches = [
+        ('génération', _generation(size=size, mineCount=mineCount)),
+        ('ouverture', _reveal(size=size)),
+        ('lecture BoardState', _read(size=size)),
+        ('positions Viewport', _viewport(size=size)),
+    ]
+    results = []
+    for name, function in benches:
+        if function is None: continue
+        setChecked(checked=True)
+        checked = _best(function=function, repeat=repeat)
+        setChecked(checked=False)
+        unchecked = _best(function=function, repeat=repeat)
+        results.append((name, checked, unchecked))
+    setChecked(checked=True)
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mesures du moteur, mode vérifié et mode rapide")
+    parser.add_argument('--size', type=int, default=200)
+    parser.add_argument('--mines', type=int, default=8000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'mesure':<20} {'vérifié (ms)':>14} {'rapide (ms)':>14} {'gain':>6}")
+    for name, checked, unchecked in run(size=args.size, mineCount=args.mines, repeat=args.repeat):
+        print(f"{name:<20} {checked:>14.1f} {unchecked:>14.1f} {checked / unchecked:>5.2f}x")
+
+if __name__ == '__main__':
+    main()
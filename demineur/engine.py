@@ -0,0 +1,691 @@
+# moteur du démineur : grille, génération, ouverture des cases, victoire et défaite
+# n'importe pas pygame, utilisable par les robots, serveurs et mesures de performance
+from typing import Iterable, List, Dict, Optional
+from collections import deque
+import random
+import os
+
+REVEAL_BUDGET = 500
+
+# identifiant de l'algorithme de placement des mines : (graine, largeur, hauteur, mines, algorithme)
+# donne toujours la même grille, toute modification du placement doit changer de version
+GENERATION_ALGORITHM = 'shuffle-v1'
+GENERATION_ALGORITHMS = ('shuffle-v1',)
+
+# premier clic : 'none' aucune protection, 'cell' la case cliquée, 'area' la case et ses voisines
+FIRST_CLICK_SAFE_MODES = ('none', 'cell', 'area')
+FIRST_CLICK_ATTEMPTS = 64
+
+# mode vérifié (développement) : les valeurs internes sont construites avec leur type et vérifiées
+# mode rapide : les boucles internes gardent des int simples, seules les entrées publiques sont vérifiées
+# choisi au démarrage avec DEMINEUR_UNCHECKED=1 ou setChecked(False)
+CHECKED = os.environ.get('DEMINEUR_UNCHECKED', '') in ('', '0')
+
+def setChecked(checked: bool) -> None:
+    global CHECKED
+    CHECKED = checked
+
+def isChecked() -> bool:
+    return CHECKED
+
+class PositiveInt(int):
+
+    def __new__(cls, value, *args, **kwargs) -> 'PositiveInt':
+        if value < 0:
+            raise ValueError("positive types must not be less than zero")
+        return  super(cls, cls).__new__(cls, value)
+    
+
+class ByteInt(int):
+
+    def __new__(cls, value, *args, **kwargs)-> 'ByteInt':
+        if value not in range(256):
+            raise ValueError("ByteInt types must be between 0 and 255")
+        return  super(cls, cls).__new__(cls, value)
+
+class Color:
+
+    _red     : 'ByteInt'
+    _green   : 'ByteInt'
+    _blue    : 'ByteInt'
+
+    def __init__(self, red:'ByteInt', green:'ByteInt', blue:'ByteInt') -> None:
+        self._red   = red
+        self._green = green
+        self._blue  = blue
+
+    def __eq__(self, __o: object) -> bool:
+        return __o._red == self._red and __o._green == self._green and __o._blue == self._blue
+
+    def getPrimaryColors(self) -> Dict[str, 'ByteInt']:
+        return {
+            'red'   : self._red,
+            'green' : self._green,
+            'blue'  : self._blue,
+        }
+    
+
+class ColorBlack(Color):
+    def __init__(self) -> None:
+        super().__init__(red=ByteInt(0), green=ByteInt(0), blue=ByteInt(0))
+
+class ColorWhite(Color):
+    def __init__(self) -> None:
+        super().__init__(red=ByteInt(255), green=ByteInt(255), blue=ByteInt(255))
+
+class OfficialCarreType(int):
+
+    MINE            : int = -1
+    FLAG            : int = -2
+    MINE_EXPLOSED   : int = -3
+    BLACK           : int = -4
+    WHITE           : int = -5
+    
+    def __new__(cls, value, *args, **kwargs) -> 'OfficialCarreType':
+        rangeExpected = range(-5, 9)
+        if value not in rangeExpected:
+            raise ValueError(f"value must be one of {rangeExpected}")
+        return  super(cls, cls).__new__(cls, value)
+
+class CarreIdentity:
+
+    _color  : 'Color'
+    _type   : 'OfficialCarreType'
+
+    def __init__(
+            self,
+            color   : 'Color'               = ColorBlack(),
+            type    : 'OfficialCarreType'   = OfficialCarreType.BLACK
+        ) -> None:
+        self._type      = type
+        self._color     = color
+
+    def __eq__(self, __o: object) -> bool:
+        return hasattr(__o, '_type') and __o._type == self._type and __o._color == self._color
+
+class Digit(int):
+
+    def __new__(cls, value, *args, **kwargs) -> 'Digit':
+        if value not in range(10):
+            raise ValueError("not digit value")
+        return  super(cls, cls).__new__(cls, value)
+
+class IdentityBlack(CarreIdentity):
+
+    def __init__(self) -> None:
+        super().__init__()
+
+class IdentityMine(CarreIdentity):
+
+    def __init__(self) -> None:
+        super().__init__(type=OfficialCarreType.MINE)
+
+class IdentityMineExplosed(CarreIdentity):
+
+    def __init__(self) -> None:
+        super().__init__(type=OfficialCarreType.MINE_EXPLOSED)
+
+class IdentityFlag(CarreIdentity):
+
+    def __init__(self) -> None:
+        super().__init__(type=OfficialCarreType.FLAG)
+
+class IdentityNumber(CarreIdentity):
+
+    def __init__(self, number: 'Digit') -> None:
+        super().__init__(type=number)
+
+class Point:
+
+    _x: 'PositiveInt'
+    _y: 'PositiveInt'
+
+    def __init__(self, x: 'PositiveInt', y: 'PositiveInt') -> None:
+        self._x = x
+        self._y = y
+
+    def __eq__(self, __o: object) -> bool:
+        return __o._x == self._x and __o._y == self._y
+
+    def getPoint(self) -> Dict[str, 'PositiveInt']:
+        return {
+            'x': self._x,
+            'y': self._y
+        }
+
+class Carre():
+
+    _identity: 'CarreIdentity'
+
+    def __init__(self, identity: 'CarreIdentity' = CarreIdentity()) -> None:
+        self._identity = identity
+
+    def __eq__(self, __o: object) -> bool:
+        return __o._identity == self._identity
+
+    def getType(self) -> 'OfficialCarreType':
+        return self._identity._type
+
+    def isDisplay(self) -> bool:
+        return not self.isBlack() and not self.isFlaged()
+
+    def isFlaged(self) -> bool:
+        return self._identity == IdentityFlag()
+
+    def isBlack(self) -> bool:
+        return self._identity == IdentityBlack()
+
+    def isMine(self) -> bool:
+        toto = self._identity == IdentityMine()
+        return self._identity == IdentityMine()
+
+class MineSchemaType(int):
+
+    def __new__(cls, value, *args, **kwargs) -> 'MineSchemaType':
+        rangeExpected = range(-1, 9)
+        if value not in rangeExpected:
+            raise ValueError(f"value must be one of {rangeExpected}")
+        return  super(cls, cls).__new__(cls, value)
+
+class Coord:
+    _coordX: 'PositiveInt'
+    _coordY: 'PositiveInt'
+
+    def __init__(self, coordX: 'PositiveInt', coordY: 'PositiveInt') -> None:
+        self._coordX = coordX
+        self._coordY = coordY
+
+    def createCarre(self, carreIdentity:'CarreIdentity') -> 'Carre':
+        return Carre(identity=carreIdentity)
+
+    def displaySlot(self, gridValue: List['SlotLine']) -> None:
+        gridValue[self._coordY].displaySlotByCoord(coordX=self._coordX)
+
+    def retrieveProximityCoord(self, gridWidth: 'PositiveInt', gridHeight: 'PositiveInt') -> List['Coord']:
+        proximityCoords = []
+
+        # line before
+        if self._coordY > 0:
+            for x in [self._coordX - 1, self._coordX, self._coordX + 1]:
+                if x in range(gridWidth): proximityCoords.append(Coord(coordX=x, coordY=self._coordY - 1))
+
+        # currentLine
+        for x in [self._coordX - 1, self._coordX + 1]:
+            if x in range(gridWidth): proximityCoords.append(Coord(coordX=x, coordY=self._coordY))
+
+        # line after
+        if self._coordY < gridHeight - 1 :
+            for x in [self._coordX - 1, self._coordX, self._coordX + 1]:
+                if x in range(gridWidth): proximityCoords.append(Coord(coordX=x, coordY=self._coordY + 1))
+
+        return proximityCoords
+
+    def incrementMineSchema(self, mineSchema=List[List[MineSchemaType]]) -> None:
+        value = mineSchema[self._coordY][self._coordX]
+        if value >= 0:
+            mineSchema[self._coordY][self._coordX] = MineSchemaType(value + 1) if CHECKED else value + 1
+
+    def getSchemaValue(self, mineSchema=List[List[MineSchemaType]]) -> 'MineSchemaType':
+        return mineSchema[self._coordY][self._coordX]
+
+    def slotIsDiplay(self, gridValue: List['SlotLine']) -> bool:
+        return gridValue[self._coordY]._value[self._coordX].isDisplay()
+
+    def slotIsMine(self, gridValue: List['SlotLine']) -> bool:
+        return gridValue[self._coordY]._value[self._coordX].isMine()
+
+    def getSlotType(self, gridValue: List['SlotLine']) -> 'OfficialCarreType':
+        return gridValue[self._coordY]._value[self._coordX].getType()
+
+    def toggleFlag(self, gridValue: List['SlotLine']) -> None:
+        gridValue[self._coordY]._value[self._coordX].toggleFlag()
+
+    def explose(self, gridValue: List['SlotLine']) -> None:
+        gridValue[self._coordY]._value[self._coordX].explose()
+
+class Slot:
+    _carre      : 'Carre'
+    _coord      : 'Coord'
+
+    def __init__(self, coord: 'Coord') -> None:
+        self._coord = coord
+        self._carre = coord.createCarre(carreIdentity=IdentityBlack())
+
+    def display(self) -> None:
+        pass
+
+    def isDisplay(self) -> bool:
+        return self._carre.isDisplay()
+
+    def toggleFlag(self) -> None:
+        if self.isDisplay(): return
+        if not self._carre.isFlaged():
+            self._carre = self._coord.createCarre(carreIdentity=IdentityFlag())
+        else:
+            self._carre = self._coord.createCarre(carreIdentity=IdentityBlack())
+
+    def isBlack(self) -> bool:
+        return self._carre.isBlack()
+
+    def isFlaged(self) -> bool:
+        return self._carre.isFlaged()
+
+    def isMine(self) -> bool:
+        return self._carre.isMine()
+
+    def getType(self) -> 'OfficialCarreType':
+        return self._carre.getType()
+    
+    def explose(self) -> None:
+        pass
+
+class SlotMine(Slot):
+
+    _isExplosed: bool = False
+
+    def display(self) -> None:
+        identity = IdentityMineExplosed() if self._isExplosed else IdentityMine()
+        self._carre = self._coord.createCarre(carreIdentity=identity)
+
+    def explose(self) -> None:
+        self._isExplosed = True
+
+class SlotEmpty(Slot):
+
+    _mineCountAtProximity: 'PositiveInt'
+
+    def __init__(self, coord: 'Coord', mineCountAtProximity: 'PositiveInt') -> None:
+        self._mineCountAtProximity = mineCountAtProximity
+        super().__init__(coord)
+
+    def display(self) -> None:
+        self._carre = self._coord.createCarre(carreIdentity=IdentityNumber(number=self._mineCountAtProximity))
+
+class SlotLine:
+    _value: List['Slot']
+
+    def __init__(self, mineSchemaLine: List['MineSchemaType'], coordY:'PositiveInt') -> None:
+        self._value = []
+        for schema in mineSchemaLine:
+            self._value.append(self._createSlot(coord=Coord(coordX=len(self._value), coordY=coordY), schema=schema))
+
+    @staticmethod
+    def _createSlot(coord: 'Coord', schema: 'MineSchemaType') -> 'Slot':
+        if schema ==  -1: 
+            return SlotMine(coord=coord)
+        return SlotEmpty(coord=coord, mineCountAtProximity=schema)
+
+    def displaySlotByCoord(self, coordX: 'PositiveInt') -> None:
+        self._value[coordX].display()
+
+    def resetSlot(self, coord: 'Coord', schema: 'MineSchemaType') -> None:
+        # seulement avant que la case soit affichée : le schéma a changé sous elle, un drapeau déjà
+        # posé est gardé
+        slot = self._createSlot(coord=coord, schema=schema)
+        if self._value[coord._coordX].isFlaged():
+            slot.toggleFlag()
+        self._value[coord._coordX] = slot
+
+class ChangeSet:
+    # index des cases modifiées depuis la dernière lecture, un par consommateur
+
+    _value: set
+
+    def __init__(self) -> None:
+        self._value = set()
+
+    def add(self, index: 'PositiveInt') -> None:
+        self._value.add(index)
+
+    def pop(self) -> set:
+        changes, self._value = self._value, set()
+        return changes
+
+class BoardState:
+    # état d'affichage compact : un octet par case, ligne après ligne
+    # la valeur stockée est le OfficialCarreType affiché, décalé pour tenir dans un octet
+
+    _width          : 'PositiveInt'
+    _height         : 'PositiveInt'
+    _value          : bytearray
+    _solution       : bytearray
+    _counts         : List[int]
+    _isShowAll      : bool
+    _subscribers    : List['ChangeSet']
+
+    def __init__(self, width: 'PositiveInt', height: 'PositiveInt', mineSchema: List[List['MineSchemaType']]) -> None:
+        self._width         = width
+        self._height        = height
+        self._value         = bytearray(width * height)
+        self._isShowAll     = False
+        self._subscribers   = []
+
+        # nombre de cases par état affiché, tenu à jour à chaque changement
+        self._counts = [0] * (9 - OfficialCarreType.BLACK)
+        self._counts[self.typeToState(OfficialCarreType.BLACK)] = width * height
+
+        # les valeurs du schéma (-1 pour une mine, sinon le nombre de mines voisines)
+        # sont aussi celles des OfficialCarreType à afficher en fin de partie
+        self._solution = bytearray(
+            value - OfficialCarreType.BLACK for schemaLine in mineSchema for value in schemaLine
+        )
+
+    @staticmethod
+    def typeToState(type: 'OfficialCarreType') -> 'ByteInt':
+        state = type - OfficialCarreType.BLACK
+        return ByteInt(state) if CHECKED else state
+
+    @staticmethod
+    def stateToType(state: 'ByteInt') -> 'OfficialCarreType':
+        type = state + OfficialCarreType.BLACK
+        return OfficialCarreType(type) if CHECKED else type
+
+    def getWidth(self) -> 'PositiveInt':
+        return self._width
+
+    def getHeight(self) -> 'PositiveInt':
+        return self._height
+
+    def __getstate__(self) -> dict:
+        # les consommateurs de changements restent dans le processus qui les a créés
+        state = self.__dict__.copy()
+        state['_subscribers'] = []
+        return state
+
+    def subscribe(self) -> 'ChangeSet':
+        changeSet = ChangeSet()
+        self._subscribers.append(changeSet)
+        return changeSet
+
+    def unsubscribe(self, changeSet: 'ChangeSet') -> None:
+        # à appeler quand le consommateur a fini, sinon chaque set() continue de le remplir
+        if changeSet in self._subscribers:
+            self._subscribers.remove(changeSet)
+
+    def set(self, coord: 'Coord', type: 'OfficialCarreType') -> None:
+        index = coord._coordY * self._width + coord._coordX
+        state = self.typeToState(type)
+        if self._value[index] == state: return
+
+        self._counts[self._value[index]]    -= 1
+        self._counts[state]                 += 1
+        self._value[index]                  = state
+        for changeSet in self._subscribers:
+            changeSet.add(index)
+
+    def get(self, coord: 'Coord') -> 'OfficialCarreType':
+        return self.stateToType(self._value[coord._coordY * self._width + coord._coordX])
+
+    def setSolution(self, coord: 'Coord', type: 'OfficialCarreType') -> None:
+        self._solution[coord._coordY * self._width + coord._coordX] = self.typeToState(type)
+
+    def showAll(self) -> None:
+        self._isShowAll = True
+
+    def isShowAll(self) -> bool:
+        return self._isShowAll
+
+    def count(self, type: 'OfficialCarreType') -> int:
+        return self._counts[self.typeToState(type)]
+
+    def getValue(self) -> bytearray:
+        # ce qui doit être dessiné : l'état courant, ou la solution une fois la partie finie
+        return self._solution if self._isShowAll else self._value
+
+    def getArea(self, columns: range, lines: range) -> bytes:
+        value = self.getValue()
+        return b''.join(
+            value[line * self._width + columns.start:line * self._width + columns.stop]
+            for line in lines
+        )
+
+def createMineSchema(width: 'PositiveInt', height: 'PositiveInt', mineCount: 'PositiveInt', rng: random.Random, excluded: Iterable[int] = ()) -> List[List['MineSchemaType']]:
+    # shuffle-v1 : mélange de Fisher-Yates de random.Random, stable entre versions de Python
+    # excluded : index (ligne après ligne) des cases qui ne reçoivent jamais de mine
+    excluded    = sorted(set(excluded))
+    slotCount   = width * height - len(excluded)
+    schema = [MineSchemaType(-1)] * mineCount + [MineSchemaType(0)] * (slotCount - mineCount)
+    rng.shuffle(schema)
+    for index in excluded:
+        schema.insert(index, MineSchemaType(0))
+
+    shemaList = []
+    for numSlotLine in range(height):
+        shemaList.append(schema[numSlotLine * width:(numSlotLine + 1) * width])
+
+    return shemaList
+
+def addMineCountAtProximity(mineSchema: List[List['MineSchemaType']], width: 'PositiveInt', height: 'PositiveInt') -> None:
+    mine = MineSchemaType(-1) if CHECKED else -1
+    for schemaLineNum in range(height):
+        for schemaSlotNum in range(width):
+            if mineSchema[schemaLineNum][schemaSlotNum] == mine:
+                coord = Coord(coordY=schemaLineNum, coordX=schemaSlotNum)
+                proximityCoords = coord.retrieveProximityCoord(gridWidth=width, gridHeight=height)
+                for proximityCoord in proximityCoords:
+                    proximityCoord.incrementMineSchema(mineSchema=mineSchema)
+
+def moveMine(mineSchema: List[List['MineSchemaType']], width: 'PositiveInt', height: 'PositiveInt', source: 'Coord', target: 'Coord') -> List['Coord']:
+    # déplacement local d'une mine : seules les cases autour de l'ancienne et de la nouvelle position
+    # sont recalculées, renvoie les cases dont la valeur a changé
+    mine    = MineSchemaType(-1) if CHECKED else -1
+    changed = [source, target]
+
+    mineSchema[target._coordY][target._coordX] = mine
+    for proximityCoord in target.retrieveProximityCoord(gridWidth=width, gridHeight=height):
+        proximityCoord.incrementMineSchema(mineSchema=mineSchema)
+        changed.append(proximityCoord)
+
+    # l'ancienne position compte ses voisines minées, ses voisines perdent une mine
+    count = 0
+    for proximityCoord in source.retrieveProximityCoord(gridWidth=width, gridHeight=height):
+        value = proximityCoord.getSchemaValue(mineSchema=mineSchema)
+        if value == -1:
+            count += 1
+        else:
+            mineSchema[proximityCoord._coordY][proximityCoord._coordX] = MineSchemaType(value - 1) if CHECKED else value - 1
+            changed.append(proximityCoord)
+    mineSchema[source._coordY][source._coordX] = MineSchemaType(count) if CHECKED else count
+
+    return changed
+
+class Grid:
+    _value          : List['SlotLine']
+    _mineSchema     : List[List['MineSchemaType']]
+    _mineCount      : 'PositiveInt'
+    _width          : 'PositiveInt'
+    _height         : 'PositiveInt'
+    _seed           : Optional[int]
+    _algorithm      : str
+    _rng            : random.Random
+    _firstClickSafe : str
+    _isFirstClick   : bool
+    _state          : 'BoardState'
+    _revealQueue    : 'deque[Coord]'
+    _revealPending  : set
+
+    def __init__(
+            self,
+            size        : Optional['PositiveInt']       = None,
+            mineCount   : 'PositiveInt'                 = 0,
+            width       : Optional['PositiveInt']       = None,
+            height      : Optional['PositiveInt']       = None,
+            seed        : Optional[int]                 = None,
+            rng         : Optional[random.Random]       = None,
+            algorithm   : str                           = GENERATION_ALGORITHM,
+            firstClickSafe: str                         = 'none',
+            mineSchema  : Optional[List[List['MineSchemaType']]] = None
+        ) -> None:
+        # size : grille carrée, sinon width et height
+        # rng : générateur fourni par l'appelant, sinon random.Random(seed) ; sans graine, une graine
+        # est tirée et gardée pour pouvoir rejouer la même grille (getSeed)
+        # firstClickSafe : voir FIRST_CLICK_SAFE_MODES, les mines sont déplacées au premier clic avec le même rng
+        # mineSchema : schéma déjà compté venant d'un autre générateur (demineur.generator), algorithm
+        # est alors le nom de ce générateur
+
+        width       = PositiveInt(width if width is not None else size)
+        height      = PositiveInt(height if height is not None else size)
+        mineCount   = PositiveInt(mineCount)
+        if mineCount > width * height:
+            raise Exception("mine count is too big")
+        if mineSchema is None and algorithm not in GENERATION_ALGORITHMS:
+            raise Exception(f"unknown generation algorithm {algorithm}")
+        if firstClickSafe not in FIRST_CLICK_SAFE_MODES:
+            raise Exception(f"unknown first click mode {firstClickSafe}")
+
+        if rng is None:
+            seed    = seed if seed is not None else random.randrange(2 ** 64)
+            rng     = random.Random(seed)
+
+        self._value         = []
+        self._mineCount     = mineCount
+        self._width         = width
+        self._height        = height
+        self._seed          = seed
+        self._algorithm     = algorithm
+        self._rng           = rng
+        self._firstClickSafe= firstClickSafe
+        self._isFirstClick  = True
+        self._revealQueue   = deque()
+        self._revealPending = set()
+
+        if mineSchema is not None:
+            self._mineSchema = mineSchema
+        else:
+            self._mineSchema = self._createMineSchema(width=width, height=height, mineCount=mineCount, rng=rng)
+            self._addMineCountAtProximityOnSchema()
+
+        self._state         = BoardState(width=width, height=height, mineSchema=self._mineSchema)
+
+        for shemaLine in self._mineSchema:
+            slotLine = SlotLine(mineSchemaLine=shemaLine, coordY=len(self._value))
+            self._value.append(slotLine)
+
+    def getState(self) -> 'BoardState':
+        return self._state
+
+    def getSeed(self) -> Optional[int]:
+        # None quand la grille vient d'un rng fourni par l'appelant
+        return self._seed
+
+    def getAlgorithm(self) -> str:
+        return self._algorithm
+
+    def getMineCount(self) -> 'PositiveInt':
+        return self._mineCount
+
+    def contains(self, coord: 'Coord') -> bool:
+        return coord._coordX in range(self._state.getWidth()) and coord._coordY in range(self._state.getHeight())
+
+    def displaySlotByCoord(self, coord: 'Coord') -> None:
+        # la case cliquée est affichée tout de suite, l'ouverture éventuelle se fait par processReveal
+        if self._isFirstClick:
+            self._isFirstClick = False
+            if self._firstClickSafe != 'none':
+                self._protectFirstClick(coord=coord)
+        self._displaySlot(coord=coord)
+
+    def isRevealing(self) -> bool:
+        return len(self._revealQueue) > 0
+
+    def processReveal(self, budget: 'PositiveInt' = REVEAL_BUDGET) -> None:
+        for _ in range(min(budget, len(self._revealQueue))):
+            coord = self._revealQueue.popleft()
+            self._revealPending.discard((coord._coordX, coord._coordY))
+            self._displaySlot(coord=coord)
+
+    def finishReveal(self) -> None:
+        while self.isRevealing():
+            self.processReveal()
+
+    def displayAll(self) -> None:
+        # fin de partie : aucune case n'est modifiée, le rendu lit directement la solution
+        self._state.showAll()
+
+    def toggleFlag(self, coord: 'Coord') -> None:
+        # une case déjà promise à l'ouverture ne peut plus être marquée
+        if (coord._coordX, coord._coordY) in self._revealPending: return
+
+        coord.toggleFlag(gridValue=self._value)
+        self._refreshState(coord=coord)
+
+    def isMine(self, coord: 'Coord') -> bool:
+        return coord.slotIsMine(gridValue=self._value)
+    
+    def exploseMine(self, coord: 'Coord') -> None:
+        coord.explose(gridValue=self._value)
+        self._state.setSolution(coord=coord, type=OfficialCarreType.MINE_EXPLOSED)
+
+    def haveBlackSlot(self) -> bool:
+        return self._state.count(type=OfficialCarreType.BLACK) > 0
+
+    def getRemainingMineCount(self) -> int:
+        # peut être négatif si trop de drapeaux sont posés
+        return self._mineCount - self._state.count(type=OfficialCarreType.FLAG)
+
+    def _displaySlot(self, coord: 'Coord') -> None:
+
+        coord.displaySlot(gridValue=self._value)
+        self._refreshState(coord=coord)
+        if coord.getSchemaValue(mineSchema=self._mineSchema) == 0:
+            proximityCoords = coord.retrieveProximityCoord(gridWidth=self._width, gridHeight=self._height)
+            for proximityCoord in proximityCoords:
+                key = (proximityCoord._coordX, proximityCoord._coordY)
+                if key not in self._revealPending and not proximityCoord.slotIsDiplay(gridValue=self._value):
+                    self._revealPending.add(key)
+                    self._revealQueue.append(proximityCoord)
+
+    def _protectFirstClick(self, coord: 'Coord') -> None:
+        # chaque mine de la zone protégée part sur une case libre tirée au hasard, seules les cases
+        # autour de l'ancienne et de la nouvelle position sont recalculées : le coût dépend du nombre
+        # de mines déplacées, pas de la taille de la grille
+        zone = [coord]
+        if self._firstClickSafe == 'area':
+            zone += coord.retrieveProximityCoord(gridWidth=self._width, gridHeight=self._height)
+        if self._mineCount > self._width * self._height - len(zone):
+            # pas assez de place hors de la zone : seule la case cliquée est protégée
+            zone = [coord]
+
+        excluded = {(zoneCoord._coordX, zoneCoord._coordY) for zoneCoord in zone}
+        for zoneCoord in zone:
+            if zoneCoord.getSchemaValue(mineSchema=self._mineSchema) != -1: continue
+
+            target = self._randomFreeCoord(excluded=excluded)
+            if target is None: return
+            self._moveMine(source=zoneCoord, target=target)
+
+    def _randomFreeCoord(self, excluded: set) -> Optional['Coord']:
+        # une case marquée d'un drapeau ne reçoit pas de mine : le drapeau mentirait sur la grille
+        for _ in range(FIRST_CLICK_ATTEMPTS):
+            coordX, coordY = self._rng.randrange(self._width), self._rng.randrange(self._height)
+            if (coordX, coordY) not in excluded and self._isFree(coordX=coordX, coordY=coordY):
+                return Coord(coordX=coordX, coordY=coordY)
+
+        # grille presque pleine : recherche de toutes les cases libres
+        free = [
+            (coordX, coordY)
+            for coordY in range(self._height) for coordX in range(self._width)
+            if (coordX, coordY) not in excluded and self._isFree(coordX=coordX, coordY=coordY)
+        ]
+        if not free: return None
+        coordX, coordY = self._rng.choice(free)
+        return Coord(coordX=coordX, coordY=coordY)
+
+    def _isFree(self, coordX: int, coordY: int) -> bool:
+        return self._mineSchema[coordY][coordX] != -1 and not self._value[coordY]._value[coordX].isFlaged()
+
+    def _moveMine(self, source: 'Coord', target: 'Coord') -> None:
+        changed = moveMine(mineSchema=self._mineSchema, width=self._width, height=self._height, source=source, target=target)
+        for changedCoord in changed:
+            schema = changedCoord.getSchemaValue(mineSchema=self._mineSchema)
+            self._value[changedCoord._coordY].resetSlot(coord=changedCoord, schema=schema)
+            self._state.setSolution(coord=changedCoord, type=schema)
+
+    def _refreshState(self, coord: 'Coord') -> None:
+        self._state.set(coord=coord, type=coord.getSlotType(gridValue=self._value))
+
+    def _createMineSchema(self, width: 'PositiveInt', height: 'PositiveInt', mineCount: 'PositiveInt', rng: random.Random) -> List[List['MineSchemaType']]:
+        return createMineSchema(width=width, height=height, mineCount=mineCount, rng=rng)
+
+    def _addMineCountAtProximityOnSchema(self) -> None:
+        addMineCountAtProximity(mineSchema=self._mineSchema, width=self._width, height=self._height)
@@ -0,0 +1,421 @@
+# génération de grilles sans devinette : une grille n'est gardée que si un solveur déterministe
+# l'ouvre en entier depuis la case de départ, par la seule logique
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import random
+import sys
+import time
+from demineur import engine
+from demineur.engine import Coord, GENERATION_ALGORITHM, Grid, MineSchemaType, PositiveInt, addMineCountAtProximity, createMineSchema, moveMine
+
+NO_GUESS_ALGORITHM = 'noguess-v1'
+# nombre maximal de passages du solveur, et de réparations locales avant de tirer une nouvelle grille
+NO_GUESS_ATTEMPTS = 2000
+NO_GUESS_REPAIRS = 40
+# nombre maximal de grilles testées pour atteindre une difficulté, tous processus confondus
+DIFFICULTY_ATTEMPTS = 20000
+# grilles testées par tâche en recherche parallèle : à la première grille trouvée, seules les
+# tâches déjà lancées sont attendues
+DIFFICULTY_BATCH = 32
+DIFFICULTY_NO_GUESS_BATCH = 2
+
+# état d'une case pour le solveur
+UNKNOWN = 0
+OPEN = 1
+MINE = 2
+
+_NEIGHBOURS: Dict[Tuple[int, int], List[Tuple[int, ...]]] = {}
+
+def neighbourTable(width: int, height: int) -> List[Tuple[int, ...]]:
+    # voisines de chaque case, en index ligne après ligne, calculées une fois par taille de grille
+    key = (width, height)
+    if key not in _NEIGHBOURS:
+        _NEIGHBOURS[key] = [
+            tuple(
+                (y + dy) * width + x + dx
+                for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+                if (dx or dy) and 0 <= x + dx < width and 0 <= y + dy < height
+            )
+            for y in range(height) for x in range(width)
+        ]
+    return _NEIGHBOURS[key]
+
+class Solver:
+    # solveur déterministe : règles sur une case, puis sur les paires de cases qui partagent des
+    # voisines inconnues, puis sur le nombre de mines restantes ; ne devine jamais
+
+    _width          : int
+    _height         : int
+    _mineCount      : int
+    _counts         : List[int]
+    _neighbours     : List[Tuple[int, ...]]
+    _known          : bytearray
+    _unknownCount   : int
+    _flagCount      : int
+    _dirty          : Set[int]
+
+    def __init__(self, mineSchema: List[List['MineSchemaType']], mineCount: int) -> None:
+        self._width         = len(mineSchema[0])
+        self._height        = len(mineSchema)
+        self._mineCount     = mineCount
+        self._counts        = [int(value) for schemaLine in mineSchema for value in schemaLine]
+        self._neighbours    = neighbourTable(width=self._width, height=self._height)
+        self._known         = bytearray(self._width * self._height)
+        self._unknownCount  = self._width * self._height
+        self._flagCount     = 0
+        self._dirty         = set()
+
+    def solve(self, start: 'Coord') -> bool:
+        self._open(index=start._coordY * self._width + start._coordX)
+        while True:
+            self._applySimpleRules()
+            if self._unknownCount == self._mineCount - self._flagCount: return True
+            if self._applyPairRules(): continue
+            if self._applyMineCountRule(): continue
+            return False
+
+    def getFrontier(self) -> List[int]:
+        # cases inconnues voisines d'une case ouverte, là où le solveur est bloqué
+        return [
+            index for index in range(len(self._known))
+            if self._known[index] == UNKNOWN and any(self._known[neighbour] == OPEN for neighbour in self._neighbours[index])
+        ]
+
+    def getKnown(self) -> bytearray:
+        return self._known
+
+    def _open(self, index: int) -> None:
+        # ouverture en cascade des cases à 0, comme Grid.processReveal
+        known, neighbours, counts = self._known, self._neighbours, self._counts
+        stack = [index]
+        while stack:
+            index = stack.pop()
+            if known[index] != UNKNOWN: continue
+
+            known[index] = OPEN
+            self._unknownCount -= 1
+            if counts[index] == 0:
+                stack.extend(neighbour for neighbour in neighbours[index] if known[neighbour] == UNKNOWN)
+            else:
+                self._dirty.add(index)
+            # les voisines ouvertes ont une inconnue de moins
+            for neighbour in neighbours[index]:
+                if known[neighbour] == OPEN and counts[neighbour] > 0: self._dirty.add(neighbour)
+
+    def _flag(self, index: int) -> None:
+        self._known[index] = MINE
+        self._unknownCount -= 1
+        self._flagCount += 1
+        for neighbour in self._neighbours[index]:
+            if self._known[neighbour] == OPEN: self._dirty.add(neighbour)
+
+    def _constraint(self, index: int) -> Tuple[List[int], int]:
+        # voisines inconnues d'une case ouverte et nombre de mines qu'il reste à y placer
+        unknown, mines = [], self._counts[index]
+        for neighbour in self._neighbours[index]:
+            state = self._known[neighbour]
+            if state == UNKNOWN: unknown.append(neighbour)
+            elif state == MINE: mines -= 1
+        return unknown, mines
+
+    def _applySimpleRules(self) -> None:
+        while self._dirty:
+            unknown, mines = self._constraint(index=self._dirty.pop())
+            if not unknown: continue
+
+            if mines == 0:
+                for neighbour in unknown: self._open(index=neighbour)
+            elif mines == len(unknown):
+                for neighbour in unknown: self._flag(index=neighbour)
+
+    def _applyPairRules(self) -> bool:
+        # deux contraintes qui se recouvrent bornent le nombre de mines de la partie commune,
+        # et donc celui de chacune des parties propres
+        constraints: Dict[int, Tuple[frozenset, int]] = {}
+        byUnknown: Dict[int, List[int]] = {}
+        for index in range(len(self._known)):
+            if self._known[index] != OPEN or self._counts[index] == 0: continue
+            unknown, mines = self._constraint(index=index)
+            if not unknown: continue
+            constraints[index] = (frozenset(unknown), mines)
+            for neighbour in unknown: byUnknown.setdefault(neighbour, []).append(index)
+
+        safe, flagged, seen = set(), set(), set()
+        for indexes in byUnknown.values():
+            for first in indexes:
+                for second in indexes:
+                    if first >= second or (first, second) in seen: continue
+                    seen.add((first, second))
+
+                    cellsA, minesA = constraints[first]
+                    cellsB, minesB = constraints[second]
+                    onlyA, onlyB, both = cellsA - cellsB, cellsB - cellsA, cellsA & cellsB
+                    low     = max(0, minesA - len(onlyA), minesB - len(onlyB))
+                    high    = min(minesA, minesB, len(both))
+                    for cells, mines in ((onlyA, minesA), (onlyB, minesB)):
+                        if not cells: continue
+                        if mines - low == 0: safe |= cells
+                        elif mines - high == len(cells): flagged |= cells
+
+        for index in sorted(flagged): self._flag(index=index)
+        for index in sorted(safe): self._open(index=index)
+        return bool(safe or flagged)
+
+    def _applyMineCountRule(self) -> bool:
+        remaining = self._mineCount - self._flagCount
+        if remaining != 0 and remaining != self._unknownCount: return False
+
+        for index in range(len(self._known)):
+            if self._known[index] != UNKNOWN: continue
+            if remaining == 0: self._open(index=index)
+            else: self._flag(index=index)
+        return True
+
+def compute3BV(mineSchema: List[List['MineSchemaType']], low: int = 0, high: Optional[int] = None) -> Optional[int]:
+    # 3BV : nombre minimal de clics pour ouvrir la grille, une ouverture (zone de 0 et sa bordure)
+    # compte pour un clic, chaque nombre hors de toute ouverture aussi
+    # un seul passage sur les valeurs du schéma ; None dès que le résultat ne peut plus tomber dans [low, high]
+    width, height = len(mineSchema[0]), len(mineSchema)
+    counts      = [value for schemaLine in mineSchema for value in schemaLine]
+    neighbours  = neighbourTable(width=width, height=height)
+    visited     = bytearray(width * height)
+    remaining   = sum(1 for count in counts if count != -1)
+    bbbv        = 0
+
+    for index, count in enumerate(counts):
+        if count != 0 or visited[index]: continue
+
+        bbbv += 1
+        visited[index] = 1
+        remaining -= 1
+        stack = [index]
+        while stack:
+            for neighbour in neighbours[stack.pop()]:
+                if visited[neighbour]: continue
+                visited[neighbour] = 1
+                remaining -= 1
+                if counts[neighbour] == 0: stack.append(neighbour)
+
+        # chaque case pas encore visitée ajoute au plus un clic
+        if high is not None and bbbv > high: return None
+        if bbbv + remaining < low: return None
+
+    # les cases restantes sont les nombres isolés
+    bbbv += remaining
+    if bbbv < low or (high is not None and bbbv > high): return None
+    return bbbv
+
+class GenerationReport:
+    _grid       : 'Grid'
+    _start      : Optional['Coord']
+    _attempts   : int
+    _boards     : int
+    _seconds    : float
+    _bbbv       : Optional[int]
+
+    def __init__(self, grid: 'Grid', start: Optional['Coord'], attempts: int, boards: int, seconds: float, bbbv: Optional[int] = None) -> None:
+        self._grid      = grid
+        self._start     = start
+        self._attempts  = attempts
+        self._boards    = boards
+        self._seconds   = seconds
+        self._bbbv      = bbbv
+
+    def getGrid(self) -> 'Grid':
+        return self._grid
+
+    def getStart(self) -> Optional['Coord']:
+        # case à ouvrir en premier, la seule d'où la grille se résout sans deviner ;
+        # None pour une grille tirée sans solveur
+        return self._start
+
+    def getAttempts(self) -> int:
+        # passages du solveur réparations comprises, ou grilles testées pour une difficulté
+        return self._attempts
+
+    def get3BV(self) -> Optional[int]:
+        # calculé seulement par generateByDifficulty
+        return self._bbbv
+
+    def getBoards(self) -> int:
+        # grilles tirées depuis zéro
+        return self._boards
+
+    def getSeconds(self) -> float:
+        return self._seconds
+
+def generateNoGuess(
+        width       : 'PositiveInt',
+        height      : 'PositiveInt',
+        mineCount   : 'PositiveInt',
+        start       : Optional['Coord']     = None,
+        seed        : Optional[int]         = None,
+        maxAttempts : int                   = NO_GUESS_ATTEMPTS
+    ) -> 'GenerationReport':
+    # start : case de départ, le centre par défaut ; elle et ses voisines sont sans mine
+    # même (graine, largeur, hauteur, mines, départ) : même grille, comme Grid pour shuffle-v1
+    startTime   = time.perf_counter()
+    width       = PositiveInt(width)
+    height      = PositiveInt(height)
+    mineCount   = PositiveInt(mineCount)
+    start       = start if start is not None else Coord(coordX=width // 2, coordY=height // 2)
+    seed        = seed if seed is not None else random.randrange(2 ** 64)
+    rng         = random.Random(seed)
+
+    zone = [start] + start.retrieveProximityCoord(gridWidth=width, gridHeight=height)
+    excluded = {coord._coordY * width + coord._coordX for coord in zone}
+    if mineCount > width * height - len(excluded):
+        raise Exception("mine count is too big for a no-guess board")
+
+    attempts, boards = 0, 0
+    while attempts < maxAttempts:
+        mineSchema = createMineSchema(width=width, height=height, mineCount=mineCount, rng=rng, excluded=excluded)
+        addMineCountAtProximity(mineSchema=mineSchema, width=width, height=height)
+        boards += 1
+
+        for _ in range(NO_GUESS_REPAIRS + 1):
+            attempts += 1
+            solver = Solver(mineSchema=mineSchema, mineCount=mineCount)
+            if solver.solve(start=start):
+                grid = Grid(width=width, height=height, mineCount=mineCount, seed=seed, algorithm=NO_GUESS_ALGORITHM, mineSchema=mineSchema)
+                return GenerationReport(grid=grid, start=start, attempts=attempts, boards=boards, seconds=time.perf_counter() - startTime)
+            if attempts >= maxAttempts or not _repair(mineSchema=mineSchema, solver=solver, excluded=excluded, rng=rng):
+                break
+
+    raise Exception(f"no no-guess board found in {attempts} attempts")
+
+def _repair(mineSchema: List[List['MineSchemaType']], solver: 'Solver', excluded: Set[int], rng: random.Random) -> bool:
+    # réparation locale : une mine de la frontière où le solveur s'est arrêté part sur une case
+    # inconnue loin des cases ouvertes, le reste de la grille est gardé
+    width, height = len(mineSchema[0]), len(mineSchema)
+    known, neighbours = solver.getKnown(), neighbourTable(width=width, height=height)
+
+    sources = [index for index in solver.getFrontier() if mineSchema[index // width][index % width] == -1]
+    targets = [
+        index for index in range(width * height)
+        if known[index] == UNKNOWN and index not in excluded
+        and mineSchema[index // width][index % width] != -1
+        and not any(known[neighbour] == OPEN for neighbour in neighbours[index])
+    ]
+    if not sources or not targets: return False
+
+    source, target = rng.choice(sources), rng.choice(targets)
+    moveMine(
+        mineSchema=mineSchema, width=width, height=height,
+        source=Coord(coordX=source % width, coordY=source // width),
+        target=Coord(coordX=target % width, coordY=target // width),
+    )
+    return True
+
+def shutdownExecutor(executor: ProcessPoolExecutor, futures: Iterable['Future']) -> None:
+    # arrêt de l'exécuteur, les tâches pas encore commencées sont abandonnées quand c'est possible :
+    # cancel_futures n'existe qu'à partir de Python 3.9, et sous Python 3.8 une tâche annulée reste
+    # connue du fil de l'exécuteur, que shutdown attend alors sans fin ; on y attend donc toutes
+    # les tâches en cours
+    if sys.version_info >= (3, 9):
+        executor.shutdown(wait=True, cancel_futures=True)
+        return
+
+    wait(list(futures))
+    executor.shutdown(wait=True)
+
+def generateByDifficulty(
+        width       : 'PositiveInt',
+        height      : 'PositiveInt',
+        mineCount   : 'PositiveInt',
+        low         : int,
+        high        : int,
+        noGuess     : bool                  = False,
+        seed        : Optional[int]         = None,
+        workers     : Optional[int]         = None,
+        maxAttempts : int                   = DIFFICULTY_ATTEMPTS
+    ) -> 'GenerationReport':
+    # grille dont le 3BV est dans [low, high] ; chaque grille testée a sa propre graine, la grille
+    # gardée se rejoue avec Grid (shuffle-v1) ou generateNoGuess (noguess-v1) et cette graine
+    # workers : recherche dans plusieurs processus, la première grille trouvée est gardée
+    # (plus rapide, mais une même graine ne donne plus forcément la même grille)
+    startTime   = time.perf_counter()
+    seed        = seed if seed is not None else random.randrange(2 ** 64)
+    if low > high:
+        raise Exception("3BV range is empty")
+
+    if not workers or workers <= 1:
+        report, attempts, boards = _searchByDifficulty(
+            width=width, height=height, mineCount=mineCount, low=low, high=high, noGuess=noGuess,
+            seed=seed, maxAttempts=maxAttempts, checked=engine.isChecked(),
+        )
+    else:
+        report, attempts, boards = _searchInParallel(
+            width=width, height=height, mineCount=mineCount, low=low, high=high, noGuess=noGuess,
+            seed=seed, maxAttempts=maxAttempts, workers=workers,
+        )
+
+    if report is None:
+        raise Exception(f"no board with a 3BV between {low} and {high} found in {attempts} attempts")
+    report._attempts    = attempts
+    report._boards      = boards
+    report._seconds     = time.perf_counter() - startTime
+    return report
+
+def _searchByDifficulty(
+        width: int, height: int, mineCount: int, low: int, high: int, noGuess: bool,
+        seed: int, maxAttempts: int, checked: bool
+    ) -> Tuple[Optional['GenerationReport'], int, int]:
+    # aussi exécuté dans les processus de travail, qui suivent le mode vérifié de l'appelant
+    # renvoie la grille trouvée ou None, les grilles testées et les grilles tirées
+    engine.setChecked(checked=checked)
+    rng = random.Random(seed)
+
+    boards = 0
+    for attempts in range(1, maxAttempts + 1):
+        boardSeed = rng.randrange(2 ** 64)
+        if noGuess:
+            report = generateNoGuess(width=width, height=height, mineCount=mineCount, seed=boardSeed)
+            grid, start = report.getGrid(), report.getStart()
+            mineSchema = grid._mineSchema
+            boards += report.getBoards()
+        else:
+            mineSchema = createMineSchema(width=width, height=height, mineCount=mineCount, rng=random.Random(boardSeed))
+            addMineCountAtProximity(mineSchema=mineSchema, width=width, height=height)
+            grid, start = None, None
+            boards += 1
+
+        bbbv = compute3BV(mineSchema=mineSchema, low=low, high=high)
+        if bbbv is None: continue
+
+        if grid is None:
+            grid = Grid(width=width, height=height, mineCount=mineCount, seed=boardSeed, algorithm=GENERATION_ALGORITHM, mineSchema=mineSchema)
+        return GenerationReport(grid=grid, start=start, attempts=attempts, boards=boards, seconds=0, bbbv=bbbv), attempts, boards
+
+    return None, maxAttempts, boards
+
+def _searchInParallel(
+        width: int, height: int, mineCount: int, low: int, high: int, noGuess: bool,
+        seed: int, maxAttempts: int, workers: int
+    ) -> Tuple[Optional['GenerationReport'], int, int]:
+    rng         = random.Random(seed)
+    batch       = DIFFICULTY_NO_GUESS_BATCH if noGuess else DIFFICULTY_BATCH
+    executor    = ProcessPoolExecutor(max_workers=workers)
+    pending     = set()
+    report, submitted, attempts, boards = None, 0, 0, 0
+    try:
+        while report is None:
+            # une tâche d'avance par processus
+            while len(pending) < 2 * workers and submitted < maxAttempts:
+                count = min(batch, maxAttempts - submitted)
+                pending.add(executor.submit(
+                    _searchByDifficulty, width, height, mineCount, low, high, noGuess,
+                    rng.randrange(2 ** 64), count, engine.isChecked(),
+                ))
+                submitted += count
+            if not pending: break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result, batchAttempts, batchBoards = future.result()
+                attempts    += batchAttempts
+                boards      += batchBoards
+                if result is not None and report is None: report = result
+    finally:
+        shutdownExecutor(executor=executor, futures=pending)
+    return report, attempts, boards
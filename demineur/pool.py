@@ -0,0 +1,128 @@
+# service de grilles sans devinette : des processus génèrent à l'avance un stock de grilles par
+# préréglage (largeur, hauteur, mines), une demande ne fait que retirer une grille du stock
+# l'exécuteur ne reçoit jamais plus d'une génération par processus, les commandes en attente
+# restent dans le service : la fermeture n'a ainsi que les générations en cours à attendre
+from concurrent.futures import Future, ProcessPoolExecutor
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Set, Tuple
+import os
+import random
+import threading
+from demineur import engine
+from demineur.generator import GenerationReport, generateNoGuess, shutdownExecutor
+
+# grilles prêtes ou en cours de génération, par préréglage
+POOL_SIZE = 8
+
+# préréglages classiques : (largeur, hauteur, mines)
+PRESETS = {
+    'beginner'      : (9, 9, 10),
+    'intermediate'  : (16, 16, 40),
+    'expert'        : (30, 16, 99),
+}
+
+Preset = Tuple[int, int, int]
+
+def _generate(width: int, height: int, mineCount: int, seed: int, checked: bool) -> 'GenerationReport':
+    # exécuté dans un processus de travail, qui suit le mode vérifié du service
+    engine.setChecked(checked=checked)
+    return generateNoGuess(width=width, height=height, mineCount=mineCount, seed=seed)
+
+class BoardPool:
+    _executor   : ProcessPoolExecutor
+    _workers    : int
+    _poolSize   : int
+    _rng        : random.Random
+    _ready      : Dict[Preset, Deque['GenerationReport']]
+    _errors     : Dict[Preset, BaseException]
+    _condition  : threading.Condition
+    _isClosed   : bool
+    _futures    : Set['Future']
+    _orders     : Deque[Preset]
+
+    def __init__(
+            self,
+            presets     : Iterable[Preset]      = PRESETS.values(),
+            poolSize    : int                   = POOL_SIZE,
+            workers     : Optional[int]         = None,
+            seed        : Optional[int]         = None
+        ) -> None:
+        # workers : nombre de processus, un par cœur par défaut
+        # seed : graine des graines données aux processus, les grilles sont alors toujours les mêmes
+        # (leur ordre d'arrivée dans le stock peut changer)
+        self._workers   = workers if workers is not None else (os.cpu_count() or 1)
+        self._executor  = ProcessPoolExecutor(max_workers=self._workers)
+        self._poolSize  = poolSize
+        self._rng       = random.Random(seed)
+        self._ready     = {}
+        self._errors    = {}
+        self._condition = threading.Condition()
+        self._isClosed  = False
+        self._futures   = set()
+        self._orders    = deque()
+
+        with self._condition:
+            for preset in presets:
+                self._ready[tuple(preset)] = deque()
+                self._orders.extend([tuple(preset)] * poolSize)
+            self._submitOrders()
+
+    def get(self, width: int, height: int, mineCount: int, timeout: Optional[float] = None) -> 'GenerationReport':
+        # retire une grille du stock et en commande une autre ; n'attend que si le stock est vide,
+        # l'erreur d'une génération n'est levée que s'il ne reste aucune grille prête
+        preset = (width, height, mineCount)
+        with self._condition:
+            if self._isClosed:
+                raise Exception("board pool is closed")
+            if preset not in self._ready:
+                raise Exception(f"unknown preset {preset}")
+
+            ready = self._ready[preset]
+            if not self._condition.wait_for(lambda: ready or preset in self._errors or self._isClosed, timeout=timeout):
+                raise TimeoutError(f"no board ready for preset {preset}")
+            if self._isClosed:
+                raise Exception("board pool is closed")
+
+            self._orders.append(preset)
+            self._submitOrders()
+            if ready:
+                return ready.popleft()
+            raise self._errors.pop(preset)
+
+    def getReadyCount(self, width: int, height: int, mineCount: int) -> int:
+        with self._condition:
+            return len(self._ready[(width, height, mineCount)])
+
+    def close(self) -> None:
+        # les commandes en attente sont abandonnées, les générations en cours sont attendues
+        with self._condition:
+            self._orders.clear()
+            self._isClosed = True
+            futures = list(self._futures)
+            self._condition.notify_all()
+        shutdownExecutor(executor=self._executor, futures=futures)
+
+    def _submitOrders(self) -> None:
+        # appelé avec le verrou pris ; une génération au plus par processus
+        while self._orders and len(self._futures) < self._workers and not self._isClosed:
+            self._submit(preset=self._orders.popleft())
+
+    def _submit(self, preset: Preset) -> None:
+        # appelé avec le verrou pris
+        width, height, mineCount = preset
+        future = self._executor.submit(_generate, width, height, mineCount, self._rng.randrange(2 ** 64), engine.isChecked())
+        self._futures.add(future)
+        future.add_done_callback(lambda future: self._store(preset=preset, future=future))
+
+    def _store(self, preset: Preset, future: 'Future') -> None:
+        # appelé par le fil de l'exécuteur à la fin de chaque génération
+        with self._condition:
+            self._futures.discard(future)
+            if future.cancelled(): return
+
+            if future.exception() is not None:
+                self._errors[preset] = future.exception()
+            else:
+                self._ready[preset].append(future.result())
+            self._submitOrders()
+            self._condition.notify_all()
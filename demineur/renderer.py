@@ -0,0 +1,141 @@
+# interface des rendus et rendus sans pygame
+from typing import Optional, Tuple, TextIO, TYPE_CHECKING
+import sys
+from demineur.engine import BoardState, ChangeSet, Coord, OfficialCarreType, Point, PositiveInt
+
+if TYPE_CHECKING:
+    from demineur.rendering import FrameRecorder
+
+class Renderer:
+    # interface des rendus : ils ne lisent que le BoardState et ses ChangeSet, jamais les Slot
+    # les opérations de vue (défilement, zoom, pointeur) ne font rien par défaut
+
+    def open(self, state: 'BoardState') -> None:
+        pass
+
+    def draw(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def coordFromScreen(self, point: 'Point') -> Optional['Coord']:
+        return None
+
+    def scroll(self, dx: int, dy: int) -> None:
+        pass
+
+    def zoom(self, step: int, anchor: 'Point') -> None:
+        pass
+
+    def centerOnMinimapClick(self, clickPosition: 'Point') -> bool:
+        return False
+
+    def setPointer(self, point: 'Point', isPressed: bool) -> None:
+        pass
+
+    def setHud(self, remainingMineCount: int, seconds: int) -> None:
+        pass
+
+    def setRecorder(self, recorder: Optional['FrameRecorder']) -> None:
+        pass
+
+class NullRenderer(Renderer):
+    # ne dessine rien mais vide ses changements, pour mesurer le moteur seul
+
+    _state  : Optional['BoardState']
+    _changes: Optional['ChangeSet']
+
+    def __init__(self) -> None:
+        self._state     = None
+        self._changes   = None
+
+    def open(self, state: 'BoardState') -> None:
+        self._state     = state
+        self._changes   = state.subscribe()
+
+    def draw(self) -> None:
+        self._changes.pop()
+
+    def close(self) -> None:
+        if self._changes is not None:
+            self._state.unsubscribe(self._changes)
+            self._changes = None
+
+class TerminalRenderer(Renderer):
+    # rendu ANSI : seules les cases modifiées sont réécrites, en plaçant le curseur dessus
+
+    CHARACTERS = {
+        OfficialCarreType.BLACK         : '#',
+        OfficialCarreType.FLAG          : '\x1b[31mF\x1b[0m',
+        OfficialCarreType.MINE          : '*',
+        OfficialCarreType.MINE_EXPLOSED : '\x1b[41m*\x1b[0m',
+        0                               : '.',
+        1                               : '\x1b[34m1\x1b[0m',
+        2                               : '\x1b[32m2\x1b[0m',
+        3                               : '\x1b[31m3\x1b[0m',
+        4                               : '\x1b[35m4\x1b[0m',
+        5                               : '\x1b[33m5\x1b[0m',
+        6                               : '\x1b[36m6\x1b[0m',
+        7                               : '\x1b[37m7\x1b[0m',
+        8                               : '\x1b[90m8\x1b[0m',
+    }
+
+    _stream     : TextIO
+    _state      : 'BoardState'
+    _changes    : 'ChangeSet'
+    _isShowAll  : bool
+    _hud        : Tuple[int, int]
+    _drawnHud   : Optional[Tuple[int, int]]
+
+    def __init__(self, stream: TextIO = sys.stdout) -> None:
+        self._stream = stream
+
+    def open(self, state: 'BoardState') -> None:
+        self._state     = state
+        self._changes   = state.subscribe()
+        self._hud       = (0, 0)
+        self._redrawAll()
+
+    def setHud(self, remainingMineCount: int, seconds: int) -> None:
+        self._hud = (remainingMineCount, seconds)
+
+    def draw(self) -> None:
+        if self._state.isShowAll() != self._isShowAll:
+            self._redrawAll()
+            return
+
+        changes = self._changes.pop()
+        if not changes and self._hud == self._drawnHud: return
+
+        value, width = self._state.getValue(), self._state.getWidth()
+        self._stream.write(''.join(self._cell(index=index, value=value, width=width) for index in sorted(changes)))
+        self._writeHud()
+        self._moveBelow()
+
+    def _writeHud(self) -> None:
+        remainingMineCount, seconds = self._hud
+        self._stream.write(f'\x1b[{self._state.getHeight() + 1};1H\x1b[2KMines : {remainingMineCount:3d}   Temps : {seconds:3d}')
+        self._drawnHud = self._hud
+
+    def close(self) -> None:
+        self._state.unsubscribe(self._changes)
+        self._moveBelow()
+
+    def _redrawAll(self) -> None:
+        self._changes.pop()
+        self._isShowAll = self._state.isShowAll()
+
+        value, width = self._state.getValue(), self._state.getWidth()
+        self._stream.write('\x1b[2J')
+        self._stream.write(''.join(self._cell(index=index, value=value, width=width) for index in range(len(value))))
+        self._writeHud()
+        self._moveBelow()
+
+    def _cell(self, index: int, value: bytearray, width: 'PositiveInt') -> str:
+        line, column = divmod(index, width)
+        return f'\x1b[{line + 1};{column * 2 + 1}H' + self.CHARACTERS[BoardState.stateToType(value[index])]
+
+    def _moveBelow(self) -> None:
+        self._stream.write(f'\x1b[{self._state.getHeight() + 2};1H')
+        self._stream.flush()
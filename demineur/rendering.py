@@ -0,0 +1,1010 @@
+# rendus pygame
+import pygame
+from typing import List, Dict, Optional, Tuple, Any
+from collections import OrderedDict
+from pygame.surface import Surface
+import time
+from concurrent.futures import ProcessPoolExecutor
+import os
+import threading
+import queue
+import struct
+import zlib
+from demineur import engine
+from demineur.engine import BoardState, ByteInt, CarreIdentity, ChangeSet, Color, ColorBlack, Coord, OfficialCarreType, Point, PositiveInt
+from demineur.renderer import Renderer
+from demineur.assets import CARRE_SIZE, TILE_SET_CACHE, TileSet, ZOOM_LEVELS
+
+GRID_SEPARATOR_SIZE = 1
+MAX_SCREEN_SIZE = 800
+LOD_CARRE_SIZE = 8
+CHUNK_SIZE = 16
+CHUNK_CACHE_MAX_BYTES = 64 * 1024 * 1024
+MINIMAP_SIZE = 200
+MINIMAP_MARGIN = 10
+THUMBNAIL_CARRE_SIZE = 4
+ATLAS_CARRE_SIZE = max(ZOOM_LEVELS)
+HOVER_COLOR = (255, 255, 255, 60)
+PRESS_COLOR = (128, 128, 128, 120)
+HUD_HEIGHT = 40
+HUD_FONT_SIZE = 32
+HUD_MARGIN = 4
+WALL_THUMBNAIL_SIZE = 96
+WALL_MARGIN = 4
+RECORD_QUEUE_SIZE = 8
+# attente maximale d'une place dans la file à la fermeture, avant de revérifier le thread d'écriture
+RECORD_CLOSE_POLL = 0.1
+
+class CarreTile(CarreIdentity):
+    # une CarreIdentity qui sait se dessiner, le moteur ne connaît pas pygame
+
+    def draw(self, screen:'Surface', position : 'Point', tileSet: 'TileSet') -> None:
+        position        = position.getPoint()
+        primaryColor    = self._color.getPrimaryColors()
+        carreSize       = tileSet.getCarreSize()
+        picture         = tileSet.getPicture(type=self._type)
+
+        pygame.draw.rect(
+            screen,
+            ( primaryColor['red'], primaryColor['green'], primaryColor['blue'] ),
+            ( position['x'], position['y'], carreSize, carreSize )
+        )
+        if picture is not None:
+            screen.blit(picture, (position['x'], position['y']))
+
+class Viewport:
+    # fenêtre de défilement sur la grille : seules les cases visibles sont dessinées
+
+    _x          : int
+    _y          : int
+    _origin     : 'Point'
+    _width      : 'PositiveInt'
+    _height     : 'PositiveInt'
+    _gridWidth  : 'PositiveInt'
+    _gridHeight : 'PositiveInt'
+    _zoomLevel  : int
+
+    def __init__(
+            self,
+            width       : 'PositiveInt',
+            height      : 'PositiveInt',
+            gridWidth   : 'PositiveInt',
+            gridHeight  : 'PositiveInt',
+            carreSize   : 'PositiveInt' = CARRE_SIZE,
+            origin      : 'Point'       = Point(x=PositiveInt(0), y=PositiveInt(0))
+        ) -> None:
+        # origin : position à l'écran du coin haut gauche de la zone de grille
+        self._x         = 0
+        self._y         = 0
+        self._origin    = origin
+        self._width     = width
+        self._height    = height
+        self._gridWidth = gridWidth
+        self._gridHeight= gridHeight
+        self._zoomLevel = ZOOM_LEVELS.index(carreSize)
+
+    @staticmethod
+    def separatorSize(carreSize: 'PositiveInt') -> 'PositiveInt':
+        # pas de séparateur quand les cases sont dessinées en un seul bloc
+        separatorSize = GRID_SEPARATOR_SIZE if carreSize >= LOD_CARRE_SIZE else 0
+        return PositiveInt(separatorSize) if engine.CHECKED else separatorSize
+
+    @staticmethod
+    def gridPixelSize(gridSize: 'PositiveInt', carreSize: 'PositiveInt' = CARRE_SIZE) -> 'PositiveInt':
+        return PositiveInt(gridSize * carreSize + (gridSize + 1) * Viewport.separatorSize(carreSize))
+
+    def getCarreSize(self) -> 'PositiveInt':
+        carreSize = ZOOM_LEVELS[self._zoomLevel]
+        return PositiveInt(carreSize) if engine.CHECKED else carreSize
+
+    def getSeparatorSize(self) -> 'PositiveInt':
+        return self.separatorSize(self.getCarreSize())
+
+    def isLod(self) -> bool:
+        return self.getCarreSize() < LOD_CARRE_SIZE
+
+    def getTileSet(self) -> 'TileSet':
+        return TILE_SET_CACHE.get(carreSize=self.getCarreSize())
+
+    def scroll(self, dx: int, dy: int) -> None:
+        self._x = min(max(self._x + dx, 0), max(self.gridPixelSize(self._gridWidth, self.getCarreSize()) - self._width, 0))
+        self._y = min(max(self._y + dy, 0), max(self.gridPixelSize(self._gridHeight, self.getCarreSize()) - self._height, 0))
+
+    def zoom(self, step: int, anchor: 'Point') -> None:
+        zoomLevel = min(max(self._zoomLevel + step, 0), len(ZOOM_LEVELS) - 1)
+        if zoomLevel == self._zoomLevel: return
+
+        # garder sous le curseur le même point de la grille
+        anchorX             = anchor.getPoint()['x'] - self._origin.getPoint()['x']
+        anchorY             = anchor.getPoint()['y'] - self._origin.getPoint()['y']
+        newCarreSize        = ZOOM_LEVELS[zoomLevel]
+        ratio               = (newCarreSize + self.separatorSize(newCarreSize)) / (self.getCarreSize() + self.getSeparatorSize())
+        self._zoomLevel     = zoomLevel
+        self.scroll(
+            dx=int((self._x + anchorX) * ratio) - anchorX - self._x,
+            dy=int((self._y + anchorY) * ratio) - anchorY - self._y,
+        )
+
+    def visibleRange(self) -> Tuple[range, range]:
+        return (
+            self._visibleCardinals(offset=self._x, length=self._width, gridSize=self._gridWidth),
+            self._visibleCardinals(offset=self._y, length=self._height, gridSize=self._gridHeight),
+        )
+
+    def carrePosition(self, coord: 'Coord') -> 'Point':
+        return Point(
+            x=self._carrePositionCalcul(coord._coordX) - self._x + self._origin.getPoint()['x'],
+            y=self._carrePositionCalcul(coord._coordY) - self._y + self._origin.getPoint()['y'],
+        )
+
+    def centerOn(self, coord: 'Coord') -> None:
+        self.scroll(
+            dx=self._carrePositionCalcul(coord._coordX) - self._x + self.getCarreSize() // 2 - self._width // 2,
+            dy=self._carrePositionCalcul(coord._coordY) - self._y + self.getCarreSize() // 2 - self._height // 2,
+        )
+
+    def getRect(self) -> Tuple[int, int, int, int]:
+        return (self._origin.getPoint()['x'], self._origin.getPoint()['y'], self._width, self._height)
+
+    def getKey(self) -> Tuple[int, int, int]:
+        # change dès que le défilement ou le zoom change
+        return (self._x, self._y, self._zoomLevel)
+
+    def coordFromScreen(self, point: 'Point') -> Optional['Coord']:
+        x = point.getPoint()['x'] - self._origin.getPoint()['x']
+        y = point.getPoint()['y'] - self._origin.getPoint()['y']
+        if x not in range(self._width) or y not in range(self._height): return None
+
+        coordX = self._coordCalcul(cardinal=x + self._x, gridSize=self._gridWidth)
+        coordY = self._coordCalcul(cardinal=y + self._y, gridSize=self._gridHeight)
+        if coordX is None or coordY is None: return None
+
+        return Coord(coordX=coordX, coordY=coordY)
+
+    def _visibleCardinals(self, offset: int, length: int, gridSize: 'PositiveInt') -> range:
+        step    = self.getCarreSize() + self.getSeparatorSize()
+        first   = max(offset // step, 0)
+        last    = min((offset + length) // step + 1, gridSize)
+        return range(first, last)
+
+    def _carrePositionCalcul(self, cardinal: 'PositiveInt') -> 'PositiveInt':
+        position = cardinal * self.getCarreSize() + (1 + cardinal) * self.getSeparatorSize()
+        return PositiveInt(position) if engine.CHECKED else position
+
+    def _coordCalcul(self, cardinal: int, gridSize: 'PositiveInt') -> Optional['PositiveInt']:
+        carreSize           = self.getCarreSize()
+        separatorSize       = self.getSeparatorSize()
+        carreCount, inCarre = divmod(cardinal - separatorSize, carreSize + separatorSize)
+        if carreCount not in range(gridSize) or inCarre >= carreSize:
+            return None
+        return PositiveInt(carreCount) if engine.CHECKED else carreCount
+
+class LodRenderer:
+    # rendu lointain : un pixel par case écrit depuis BoardState, puis agrandi d'un seul coup
+
+    _palette: Optional[List[Tuple[int, int, int]]]
+
+    def __init__(self) -> None:
+        self._palette = None
+
+    def draw(self, screen:'Surface', viewport: 'Viewport', state: 'BoardState') -> None:
+        columns, lines = viewport.visibleRange()
+        if not columns or not lines: return
+
+        area = pygame.image.frombuffer(state.getArea(columns=columns, lines=lines), (len(columns), len(lines)), 'P')
+        area.set_palette(self.getPalette())
+
+        carreSize   = viewport.getCarreSize()
+        area        = pygame.transform.scale(area, (len(columns) * carreSize, len(lines) * carreSize))
+        position    = viewport.carrePosition(Coord(coordX=columns.start, coordY=lines.start)).getPoint()
+        screen.blit(area, (position['x'], position['y']))
+
+    def getPalette(self) -> List[Tuple[int, int, int]]:
+        # couleur moyenne de chaque image, pour rester fidèle au rendu détaillé
+        if self._palette is None:
+            tileSet     = TILE_SET_CACHE.get(carreSize=PositiveInt(LOD_CARRE_SIZE))
+            primaryColor= ColorBlack().getPrimaryColors()
+            palette     = []
+            for officialType in range(OfficialCarreType.BLACK, 9):
+                carre = Surface((LOD_CARRE_SIZE, LOD_CARRE_SIZE))
+                carre.fill((primaryColor['red'], primaryColor['green'], primaryColor['blue']))
+                picture = tileSet.getPicture(type=officialType)
+                if picture is not None:
+                    carre.blit(picture, (0, 0))
+                palette.append(tuple(pygame.transform.average_color(carre))[:3])
+            self._palette = palette + [(0, 0, 0)] * (256 - len(palette))
+        return self._palette
+
+LOD_RENDERER = LodRenderer()
+
+class ChunkCache:
+    # surfaces de chunks déjà rendues, les moins récemment utilisées sont évincées au-delà de la limite mémoire
+
+    _maxBytes   : 'PositiveInt'
+    _bytes      : int
+    _value      : 'OrderedDict[Tuple[bool, int, int, int], Surface]'
+
+    def __init__(self, maxBytes: 'PositiveInt') -> None:
+        self._maxBytes  = maxBytes
+        self._bytes     = 0
+        self._value     = OrderedDict()
+
+    def get(self, key: Tuple[bool, int, int, int]) -> Optional['Surface']:
+        surface = self._value.get(key)
+        if surface is not None:
+            self._value.move_to_end(key)
+        return surface
+
+    def put(self, key: Tuple[bool, int, int, int], surface: 'Surface') -> None:
+        self.discard(key=key)
+        self._value[key]    = surface
+        self._bytes         += self._surfaceBytes(surface)
+        while self._bytes > self._maxBytes and len(self._value) > 1:
+            _, evicted      = self._value.popitem(last=False)
+            self._bytes     -= self._surfaceBytes(evicted)
+
+    def discard(self, key: Tuple[bool, int, int, int]) -> None:
+        surface = self._value.pop(key, None)
+        if surface is not None:
+            self._bytes -= self._surfaceBytes(surface)
+
+    def _surfaceBytes(self, surface: 'Surface') -> int:
+        return surface.get_pitch() * surface.get_height()
+
+class ChunkRenderer:
+    # la grille est découpée en chunks de CHUNK_SIZE x CHUNK_SIZE cases pré-rendus,
+    # un chunk n'est redessiné que si une de ses cases a changé
+
+    _state      : 'BoardState'
+    _changes    : 'ChangeSet'
+    _cache      : 'ChunkCache'
+    _identities : Dict['OfficialCarreType', 'CarreTile']
+
+    def __init__(self, state: 'BoardState') -> None:
+        self._state         = state
+        self._changes       = state.subscribe()
+        self._cache         = ChunkCache(maxBytes=PositiveInt(CHUNK_CACHE_MAX_BYTES))
+        self._identities    = {officialType: CarreTile(type=officialType) for officialType in range(OfficialCarreType.BLACK, 9)}
+
+    def close(self) -> None:
+        self._state.unsubscribe(self._changes)
+
+    def draw(self, screen:'Surface', viewport: 'Viewport') -> None:
+        self._invalidateChanges()
+
+        columns, lines  = viewport.visibleRange()
+        tileSet         = viewport.getTileSet()
+        separatorSize   = viewport.getSeparatorSize()
+        for chunkY in self._chunkRange(cardinals=lines):
+            for chunkX in self._chunkRange(cardinals=columns):
+                chunk = self._getChunk(chunkX=chunkX, chunkY=chunkY, tileSet=tileSet, separatorSize=separatorSize)
+                position = viewport.carrePosition(Coord(coordX=chunkX * CHUNK_SIZE, coordY=chunkY * CHUNK_SIZE)).getPoint()
+                screen.blit(chunk, (position['x'] - separatorSize, position['y'] - separatorSize))
+
+    def _chunkRange(self, cardinals: range) -> range:
+        if not cardinals: return range(0)
+        return range(cardinals.start // CHUNK_SIZE, (cardinals.stop - 1) // CHUNK_SIZE + 1)
+
+    def _invalidateChanges(self) -> None:
+        width   = self._state.getWidth()
+        chunks  = {((index % width) // CHUNK_SIZE, (index // width) // CHUNK_SIZE) for index in self._changes.pop()}
+        for chunkX, chunkY in chunks:
+            for carreSize in ZOOM_LEVELS:
+                self._cache.discard(key=(False, carreSize, chunkX, chunkY))
+
+    def _getChunk(self, chunkX: int, chunkY: int, tileSet: 'TileSet', separatorSize: 'PositiveInt') -> 'Surface':
+        # les chunks de fin de partie ne remplacent pas ceux de l'état courant
+        key     = (self._state.isShowAll(), tileSet.getCarreSize(), chunkX, chunkY)
+        chunk   = self._cache.get(key=key)
+        if chunk is None:
+            chunk = self._renderChunk(chunkX=chunkX, chunkY=chunkY, tileSet=tileSet, separatorSize=separatorSize)
+            self._cache.put(key=key, surface=chunk)
+        return chunk
+
+    def _renderChunk(self, chunkX: int, chunkY: int, tileSet: 'TileSet', separatorSize: 'PositiveInt') -> 'Surface':
+        columns = range(chunkX * CHUNK_SIZE, min((chunkX + 1) * CHUNK_SIZE, self._state.getWidth()))
+        lines   = range(chunkY * CHUNK_SIZE, min((chunkY + 1) * CHUNK_SIZE, self._state.getHeight()))
+        step    = tileSet.getCarreSize() + separatorSize
+
+        chunk = Surface((len(columns) * step, len(lines) * step))
+        chunk.fill((ByteInt(255), ByteInt(255), ByteInt(255)))
+
+        states = self._state.getArea(columns=columns, lines=lines)
+        for index, state in enumerate(states):
+            line, column = divmod(index, len(columns))
+            position = Point(x=separatorSize + column * step, y=separatorSize + line * step)
+            self._identities[BoardState.stateToType(state)].draw(screen=chunk, position=position, tileSet=tileSet)
+        return chunk
+
+class BoardPainter:
+    # dessine la partie visible d'un BoardState : pixels agrandis de loin, chunks d'images de près
+    # les chunks ne sont créés, et abonnés aux changements, qu'au premier dessin de près
+
+    _state          : 'BoardState'
+    _chunkRenderer  : Optional['ChunkRenderer']
+
+    def __init__(self, state: 'BoardState') -> None:
+        self._state         = state
+        self._chunkRenderer = None
+
+    def paint(self, screen: 'Surface', viewport: 'Viewport') -> None:
+        if viewport.isLod():
+            LOD_RENDERER.draw(screen=screen, viewport=viewport, state=self._state)
+            return
+
+        if self._chunkRenderer is None:
+            self._chunkRenderer = ChunkRenderer(state=self._state)
+        self._chunkRenderer.draw(screen=screen, viewport=viewport)
+
+    def close(self) -> None:
+        if self._chunkRenderer is not None:
+            self._chunkRenderer.close()
+            self._chunkRenderer = None
+
+class OffscreenRenderer:
+    # rendu d'une grille dans un simple Surface, sans fenêtre (fonctionne avec SDL_VIDEODRIVER=dummy)
+    # close une fois les rendus faits : les chunks gardés entre deux rendus suivent la partie
+
+    _state      : 'BoardState'
+    _painter    : 'BoardPainter'
+
+    def __init__(self, state: 'BoardState') -> None:
+        self._state     = state
+        self._painter   = BoardPainter(state=state)
+
+    def render(self, viewport: Optional['Viewport'] = None, carreSize: 'PositiveInt' = CARRE_SIZE) -> 'Surface':
+        if viewport is None:
+            # toute la grille à la taille de carré demandée
+            viewport = Viewport(
+                width       = Viewport.gridPixelSize(self._state.getWidth(), carreSize),
+                height      = Viewport.gridPixelSize(self._state.getHeight(), carreSize),
+                gridWidth   = self._state.getWidth(),
+                gridHeight  = self._state.getHeight(),
+                carreSize   = carreSize,
+            )
+
+        screen = Surface(viewport.getRect()[2:])
+        screen.fill((ByteInt(255), ByteInt(255), ByteInt(255)))
+        self._painter.paint(screen=screen, viewport=viewport)
+        return screen
+
+    def save(self, path: str, viewport: Optional['Viewport'] = None, carreSize: 'PositiveInt' = CARRE_SIZE) -> None:
+        pygame.image.save(self.render(viewport=viewport, carreSize=carreSize), path)
+
+    def close(self) -> None:
+        self._painter.close()
+
+def _initThumbnailWorker() -> None:
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+def renderThumbnail(state: 'BoardState', path: str, carreSize: 'PositiveInt' = THUMBNAIL_CARRE_SIZE) -> str:
+    renderer = OffscreenRenderer(state=state)
+    try:
+        renderer.save(path=path, carreSize=carreSize)
+    finally:
+        renderer.close()
+    return path
+
+def renderThumbnails(jobs: List[Tuple['BoardState', str]], carreSize: 'PositiveInt' = THUMBNAIL_CARRE_SIZE, maxWorkers: Optional[int] = None) -> List[str]:
+    # un BoardState se sérialise en quelques octets par case, le rendu se fait dans les processus
+    with ProcessPoolExecutor(max_workers=maxWorkers, initializer=_initThumbnailWorker) as executor:
+        futures = [executor.submit(renderThumbnail, state, path, carreSize) for state, path in jobs]
+        return [future.result() for future in futures]
+
+class Minimap:
+    # vue d'ensemble : un pixel par bloc de cases, seuls les pixels des cases modifiées sont réécrits
+
+    _state      : 'BoardState'
+    _changes    : 'ChangeSet'
+    _position   : 'Point'
+    _block      : 'PositiveInt'
+    _scale      : 'PositiveInt'
+    _width      : 'PositiveInt'
+    _height     : 'PositiveInt'
+    _pixels     : bytearray
+    _surface    : 'Surface'
+    _isShowAll  : bool
+
+    def __init__(self, state: 'BoardState', position: 'Point', size: 'PositiveInt' = MINIMAP_SIZE) -> None:
+        self._state     = state
+        self._changes   = state.subscribe()
+        self._position  = position
+
+        boardSize       = max(state.getWidth(), state.getHeight())
+        self._block     = PositiveInt(-(-boardSize // size))
+        self._width     = PositiveInt(-(-state.getWidth() // self._block))
+        self._height    = PositiveInt(-(-state.getHeight() // self._block))
+        self._scale     = PositiveInt(max(size // max(self._width, self._height), 1))
+
+        self._pixels = bytearray(self._width * self._height)
+        self._sample()
+        # le surface partage la mémoire de _pixels
+        self._surface = pygame.image.frombuffer(self._pixels, (self._width, self._height), 'P')
+        self._surface.set_palette(LOD_RENDERER.getPalette())
+
+    def close(self) -> None:
+        self._state.unsubscribe(self._changes)
+
+    def update(self) -> bool:
+        # indique si des pixels ont changé depuis le dernier appel
+        if self._state.isShowAll() != self._isShowAll:
+            self._changes.pop()
+            self._sample()
+            return True
+        return self._applyChanges()
+
+    def blit(self, screen: 'Surface') -> None:
+        position = self._position.getPoint()
+        if self._scale > 1:
+            screen.blit(pygame.transform.scale(self._surface, (self._width * self._scale, self._height * self._scale)), (position['x'], position['y']))
+        else:
+            screen.blit(self._surface, (position['x'], position['y']))
+
+    def draw(self, screen: 'Surface', viewport: 'Viewport') -> None:
+        self.update()
+        self.blit(screen=screen)
+
+        position        = self._position.getPoint()
+        columns, lines  = viewport.visibleRange()
+        ratio           = self._scale / self._block
+        pygame.draw.rect(
+            screen,
+            (ByteInt(255), ByteInt(0), ByteInt(0)),
+            (
+                position['x'] + int(columns.start * ratio),
+                position['y'] + int(lines.start * ratio),
+                max(int(len(columns) * ratio), 1),
+                max(int(len(lines) * ratio), 1),
+            ),
+            1
+        )
+
+    def getRect(self) -> Tuple[int, int, int, int]:
+        return (self._position.getPoint()['x'], self._position.getPoint()['y'], self._width * self._scale, self._height * self._scale)
+
+    def coordFromScreen(self, point: 'Point') -> Optional['Coord']:
+        x = point.getPoint()['x'] - self._position.getPoint()['x']
+        y = point.getPoint()['y'] - self._position.getPoint()['y']
+        if x not in range(self._width * self._scale) or y not in range(self._height * self._scale): return None
+
+        return Coord(
+            coordX=PositiveInt(min(x * self._block // self._scale, self._state.getWidth() - 1)),
+            coordY=PositiveInt(min(y * self._block // self._scale, self._state.getHeight() - 1)),
+        )
+
+    def _sample(self) -> None:
+        # première case de chaque bloc, ensuite chaque case modifiée écrase le pixel de son bloc
+        value, width    = self._state.getValue(), self._state.getWidth()
+        self._isShowAll = self._state.isShowAll()
+        self._pixels[:] = b''.join(
+            bytes(value[line * width:(line + 1) * width:self._block])
+            for line in range(0, self._state.getHeight(), self._block)
+        )
+
+    def _applyChanges(self) -> bool:
+        value, width    = self._state.getValue(), self._state.getWidth()
+        changes         = self._changes.pop()
+        for index in changes:
+            line, column = divmod(index, width)
+            self._pixels[(line // self._block) * self._width + column // self._block] = value[index]
+        return len(changes) > 0
+
+class ThumbnailWall:
+    # mur de miniatures pour suivre plusieurs parties : une Minimap par partie,
+    # seules les miniatures dont la partie a changé sont redessinées et envoyées à l'écran
+
+    _columns    : 'PositiveInt'
+    _size       : 'PositiveInt'
+    _thumbnails : List['Minimap']
+    _screen     : Optional['Surface']
+
+    def __init__(self, states: List['BoardState'], columns: Optional['PositiveInt'] = None, size: 'PositiveInt' = WALL_THUMBNAIL_SIZE) -> None:
+        self._columns       = columns if columns is not None else PositiveInt(max(int(len(states) ** 0.5 + 0.999), 1))
+        self._size          = size
+        self._thumbnails    = [self._createThumbnail(index=index, state=state) for index, state in enumerate(states)]
+        self._screen        = None
+
+    def open(self) -> None:
+        lines           = -(-len(self._thumbnails) // self._columns)
+        step            = self._size + WALL_MARGIN
+        self._screen    = pygame.display.set_mode((self._columns * step + WALL_MARGIN, lines * step + WALL_MARGIN))
+        self._screen.fill((ByteInt(64), ByteInt(64), ByteInt(64)))
+        for thumbnail in self._thumbnails:
+            thumbnail.update()
+            thumbnail.blit(screen=self._screen)
+        pygame.display.update()
+
+    def setState(self, index: int, state: 'BoardState') -> None:
+        # une partie terminée est remplacée par une nouvelle
+        self._thumbnails[index].close()
+        self._thumbnails[index] = self._createThumbnail(index=index, state=state)
+        if self._screen is None: return
+
+        self._screen.fill((ByteInt(64), ByteInt(64), ByteInt(64)), self._cellRect(index=index))
+        self._thumbnails[index].blit(screen=self._screen)
+        pygame.display.update(self._cellRect(index=index))
+
+    def draw(self) -> None:
+        rects = []
+        for thumbnail in self._thumbnails:
+            if thumbnail.update():
+                thumbnail.blit(screen=self._screen)
+                rects.append(thumbnail.getRect())
+        if rects:
+            pygame.display.update(rects)
+
+    def _cellRect(self, index: int) -> Tuple[int, int, int, int]:
+        line, column = divmod(index, self._columns)
+        return (WALL_MARGIN + column * (self._size + WALL_MARGIN), WALL_MARGIN + line * (self._size + WALL_MARGIN), self._size, self._size)
+
+    def _createThumbnail(self, index: int, state: 'BoardState') -> 'Minimap':
+        x, y, _, _ = self._cellRect(index=index)
+        return Minimap(state=state, position=Point(x=x, y=y), size=self._size)
+
+class FrameRecorder:
+    # enregistrement de la partie : le thread principal ne fait que copier les zones modifiées dans
+    # des surfaces et les déposer dans une file bornée, un thread d'écriture s'occupe de la conversion
+    # en octets, de la compression et du disque
+    # si l'écriture prend du retard les images sont abandonnées, l'image suivante est alors complète
+    # formats : 'png' une image par frame, 'delta' un seul fichier de zones compressées avec zlib
+    #   delta : par image '<IIH' (numéro, millisecondes, nombre de zones) puis par zone '<HHHHI' (x, y, w, h, taille) et les octets RGB compressés
+
+    FORMATS = ('png', 'delta')
+
+    _directory  : str
+    _format     : str
+    _queue      : 'queue.Queue[Optional[Tuple[int, int, Tuple[int, int], List[Tuple[Tuple[int, int, int, int], Surface]]]]]'
+    _thread     : 'threading.Thread'
+    _frameCount : int
+    _dropCount  : int
+    _needsFull  : bool
+    _startTime  : float
+    _error      : Optional[BaseException]
+
+    def __init__(self, directory: str, format: str = 'png', queueSize: 'PositiveInt' = RECORD_QUEUE_SIZE) -> None:
+        if format not in self.FORMATS:
+            raise Exception(f"unknown record format {format}")
+
+        os.makedirs(directory, exist_ok=True)
+        self._directory     = directory
+        self._format        = format
+        self._queue         = queue.Queue(maxsize=queueSize)
+        self._frameCount    = 0
+        self._dropCount     = 0
+        self._needsFull     = True
+        self._startTime     = time.monotonic()
+        self._error         = None
+        self._thread        = threading.Thread(target=self._write, name="FrameRecorder", daemon=True)
+        self._thread.start()
+
+    def capture(self, screen: 'Surface', rects: Optional[List[Tuple[int, int, int, int]]] = None) -> None:
+        # rects None : toute la surface
+        if self._queue.full() or not self._thread.is_alive():
+            self._dropCount += 1
+            self._needsFull = True
+            return
+
+        if rects is None or self._needsFull:
+            rects = [(0, 0, screen.get_width(), screen.get_height())]
+        screenRect  = screen.get_rect()
+        areas       = []
+        for rect in rects:
+            rect = screenRect.clip(rect)
+            if rect.width and rect.height:
+                areas.append((tuple(rect), screen.subsurface(rect).copy()))
+
+        milliseconds = int((time.monotonic() - self._startTime) * 1000)
+        self._queue.put_nowait((self._frameCount, milliseconds, screen.get_size(), areas))
+        self._frameCount    += 1
+        self._needsFull     = False
+
+    def getDropCount(self) -> int:
+        return self._dropCount
+
+    def close(self) -> None:
+        # si le thread d'écriture s'est arrêté sur une erreur, la file n'est plus vidée : on ne
+        # l'attend que tant qu'il tourne, puis son erreur est remontée
+        while self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=RECORD_CLOSE_POLL)
+                break
+            except queue.Full:
+                pass
+        self._thread.join()
+        if self._error is not None:
+            raise Exception(f"frame recording failed: {self._error}") from self._error
+
+    def _write(self) -> None:
+        # une erreur (disque plein, dossier supprimé...) arrête l'écriture, close la remonte
+        try:
+            self._writeFrames()
+        except Exception as error:
+            self._error = error
+
+    def _writeFrames(self) -> None:
+        canvas  = None
+        stream  = open(os.path.join(self._directory, 'frames.delta'), 'wb') if self._format == 'delta' else None
+        try:
+            while True:
+                frame = self._queue.get()
+                if frame is None: break
+
+                frameIndex, milliseconds, size, areas = frame
+                if stream is not None:
+                    stream.write(struct.pack('<IIH', frameIndex, milliseconds, len(areas)))
+                    for (x, y, w, h), area in areas:
+                        data = zlib.compress(pygame.image.tostring(area, 'RGB'), 1)
+                        stream.write(struct.pack('<HHHHI', x, y, w, h, len(data)))
+                        stream.write(data)
+                    continue
+
+                # png : les zones sont appliquées sur une copie de l'écran avant chaque sauvegarde
+                if canvas is None or canvas.get_size() != size:
+                    canvas = Surface(size)
+                for (x, y, w, h), area in areas:
+                    canvas.blit(area, (x, y))
+                pygame.image.save(canvas, os.path.join(self._directory, f'frame_{frameIndex:06d}.png'))
+        finally:
+            if stream is not None:
+                stream.close()
+
+class GlyphAtlas:
+    # chiffres rendus une seule fois avec pygame.font dans une seule surface, ensuite de simples blits
+
+    GLYPHS = '0123456789-'
+
+    _atlas          : 'Surface'
+    _glyphWidth     : 'PositiveInt'
+    _glyphHeight    : 'PositiveInt'
+
+    def __init__(self, size: 'PositiveInt', color: 'Color') -> None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font            = pygame.font.Font(None, size)
+        primaryColor    = color.getPrimaryColors()
+        glyphs          = [font.render(glyph, True, (primaryColor['red'], primaryColor['green'], primaryColor['blue'])) for glyph in self.GLYPHS]
+
+        self._glyphWidth    = PositiveInt(max(glyph.get_width() for glyph in glyphs))
+        self._glyphHeight   = PositiveInt(max(glyph.get_height() for glyph in glyphs))
+        self._atlas         = Surface((self._glyphWidth * len(glyphs), self._glyphHeight), pygame.SRCALPHA)
+        for index, glyph in enumerate(glyphs):
+            self._atlas.blit(glyph, (index * self._glyphWidth + (self._glyphWidth - glyph.get_width()) // 2, 0))
+
+    def getSize(self, text: str) -> Tuple[int, int]:
+        return (len(text) * self._glyphWidth, self._glyphHeight)
+
+    def draw(self, screen: 'Surface', text: str, position: 'Point') -> None:
+        position = position.getPoint()
+        for count, glyph in enumerate(text):
+            area = (self.GLYPHS.index(glyph) * self._glyphWidth, 0, self._glyphWidth, self._glyphHeight)
+            screen.blit(self._atlas, (position['x'] + count * self._glyphWidth, position['y']), area)
+
+class PygameRenderer(Renderer):
+    # fenêtre pygame : grille défilante et zoomable, minimap si la grille ne tient pas à l'écran
+
+    _state          : 'BoardState'
+    _changes        : 'ChangeSet'
+    _screen         : 'Surface'
+    _viewport       : 'Viewport'
+    _painter        : 'BoardPainter'
+    _minimap        : Optional['Minimap']
+    _identities     : Dict['OfficialCarreType', 'CarreTile']
+    _drawnView      : Optional[Tuple[bool, int, int, int]]
+    _highlight      : Dict[Tuple[int, int], bool]
+    _drawnHighlight : Dict[Tuple[int, int], bool]
+    _overlays       : Dict[Tuple[bool, int], 'Surface']
+    _glyphs         : 'GlyphAtlas'
+    _hud            : Tuple[int, int]
+    _drawnHud       : Optional[Tuple[int, int]]
+    _recorder       : Optional['FrameRecorder']
+
+    def __init__(self) -> None:
+        self._recorder = None
+
+    def setRecorder(self, recorder: Optional['FrameRecorder']) -> None:
+        self._recorder = recorder
+
+    def open(self, state: 'BoardState') -> None:
+        gridPixelWidth  = Viewport.gridPixelSize(state.getWidth())
+        gridPixelHeight = Viewport.gridPixelSize(state.getHeight())
+        boardWidth      = PositiveInt(min(gridPixelWidth, MAX_SCREEN_SIZE))
+        boardHeight     = PositiveInt(min(gridPixelHeight, MAX_SCREEN_SIZE))
+
+        self._state         = state
+        self._changes       = state.subscribe()
+        self._viewport      = Viewport(
+            width       = boardWidth,
+            height      = boardHeight,
+            gridWidth   = state.getWidth(),
+            gridHeight  = state.getHeight(),
+            origin      = Point(x=PositiveInt(0), y=PositiveInt(HUD_HEIGHT)),
+        )
+        self._painter       = BoardPainter(state=state)
+        self._identities    = {officialType: CarreTile(type=officialType) for officialType in range(OfficialCarreType.BLACK, 9)}
+        self._drawnView     = None
+        self._highlight     = {}
+        self._drawnHighlight= {}
+        self._overlays      = {}
+        self._glyphs        = GlyphAtlas(size=PositiveInt(HUD_FONT_SIZE), color=Color(red=ByteInt(255), green=ByteInt(0), blue=ByteInt(0)))
+        self._hud           = (0, 0)
+        self._drawnHud      = None
+
+        # la minimap n'est utile que si la grille ne tient pas dans la fenêtre
+        if max(gridPixelWidth, gridPixelHeight) > MAX_SCREEN_SIZE:
+            self._minimap   = Minimap(state=state, position=Point(x=boardWidth + MINIMAP_MARGIN, y=HUD_HEIGHT + MINIMAP_MARGIN))
+            self._screen    = self._createScreen(size=(boardWidth + MINIMAP_SIZE + 2 * MINIMAP_MARGIN, HUD_HEIGHT + max(boardHeight, MINIMAP_SIZE + 2 * MINIMAP_MARGIN)))
+        else:
+            self._minimap   = None
+            self._screen    = self._createScreen(size=(boardWidth, HUD_HEIGHT + boardHeight))
+
+    def _createScreen(self, size: Tuple[int, int]) -> 'Surface':
+        return pygame.display.set_mode(size)
+
+    def draw(self) -> None:
+        view = (self._state.isShowAll(),) + self._viewport.getKey()
+        if view != self._drawnView:
+            self._drawAll()
+            self._drawnView = view
+        else:
+            self._drawChanges()
+        self._drawnHighlight = self._highlight
+
+    def _drawAll(self) -> None:
+        self._changes.pop()
+        self._screen.fill((ByteInt(255), ByteInt(255), ByteInt(255)))
+        self._screen.set_clip(self._viewport.getRect())
+        self._painter.paint(screen=self._screen, viewport=self._viewport)
+        if not self._viewport.isLod():
+            for (coordX, coordY), isPressed in self._highlight.items():
+                self._drawOverlay(coord=Coord(coordX=coordX, coordY=coordY), isPressed=isPressed)
+        self._screen.set_clip(None)
+        if self._minimap is not None:
+            self._minimap.draw(screen=self._screen, viewport=self._viewport)
+        self._drawHud()
+        self._present()
+
+    def _present(self, rects: Optional[List[Tuple[int, int, int, int]]] = None) -> None:
+        if rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+        if self._recorder is not None:
+            self._recorder.capture(screen=self._screen, rects=rects)
+
+    def _drawChanges(self) -> None:
+        # seules les cases modifiées et celles dont la surbrillance change sont redessinées
+        changes = self._changes.pop()
+        width   = self._state.getWidth()
+        carres  = {(index % width, index // width) for index in changes}
+        carres  |= {key for key in self._highlight.keys() | self._drawnHighlight.keys() if self._highlight.get(key) != self._drawnHighlight.get(key)}
+
+        rects = []
+        if self._hud != self._drawnHud:
+            rects.append(self._drawHud())
+        if not carres:
+            if rects: self._present(rects=rects)
+            return
+
+        if self._viewport.isLod():
+            # pas de surbrillance en vue lointaine : seules les cases modifiées comptent
+            if changes:
+                self._drawAll()
+            elif rects:
+                self._present(rects=rects)
+            return
+
+        tileSet = self._viewport.getTileSet()
+        columns, lines = self._viewport.visibleRange()
+        self._screen.set_clip(self._viewport.getRect())
+        for coordX, coordY in carres:
+            if coordX not in columns or coordY not in lines: continue
+            rects.append(self._drawCarre(coord=Coord(coordX=coordX, coordY=coordY), tileSet=tileSet))
+        self._screen.set_clip(None)
+
+        if self._minimap is not None and changes:
+            self._minimap.draw(screen=self._screen, viewport=self._viewport)
+            rects.append(self._minimap.getRect())
+        self._present(rects=rects)
+
+    def setHud(self, remainingMineCount: int, seconds: int) -> None:
+        self._hud = (remainingMineCount, seconds)
+
+    def _drawHud(self) -> Tuple[int, int, int, int]:
+        # bandeau du haut : mines restantes à gauche, chronomètre à droite
+        rect = (0, 0, self._screen.get_width(), HUD_HEIGHT)
+        self._screen.fill((ByteInt(192), ByteInt(192), ByteInt(192)), rect)
+
+        remainingMineCount, seconds = self._hud
+        texts = (f"{min(max(remainingMineCount, -99), 999):03d}", f"{min(seconds, 999):03d}")
+        for text, alignRight in zip(texts, (False, True)):
+            width, height   = self._glyphs.getSize(text=text)
+            x               = self._screen.get_width() - width - 2 * HUD_MARGIN if alignRight else 2 * HUD_MARGIN
+            y               = (HUD_HEIGHT - height) // 2
+            self._screen.fill((ByteInt(0), ByteInt(0), ByteInt(0)), (x - HUD_MARGIN, y - HUD_MARGIN // 2, width + 2 * HUD_MARGIN, height + HUD_MARGIN))
+            self._glyphs.draw(screen=self._screen, text=text, position=Point(x=x, y=y))
+
+        self._drawnHud = self._hud
+        return rect
+
+    def _drawCarre(self, coord: 'Coord', tileSet: 'TileSet') -> Tuple[int, int, int, int]:
+        # getValue : la solution une fois la partie finie, comme _drawAll
+        position = self._viewport.carrePosition(coord=coord)
+        state = self._state.getValue()[coord._coordY * self._state.getWidth() + coord._coordX]
+        self._identities[BoardState.stateToType(state)].draw(screen=self._screen, position=position, tileSet=tileSet)
+
+        isPressed = self._highlight.get((coord._coordX, coord._coordY))
+        if isPressed is not None:
+            self._drawOverlay(coord=coord, isPressed=isPressed)
+        return (position.getPoint()['x'], position.getPoint()['y'], tileSet.getCarreSize(), tileSet.getCarreSize())
+
+    def _drawOverlay(self, coord: 'Coord', isPressed: bool) -> None:
+        carreSize   = self._viewport.getCarreSize()
+        key         = (isPressed, carreSize)
+        if key not in self._overlays:
+            overlay = Surface((carreSize, carreSize), pygame.SRCALPHA)
+            overlay.fill(PRESS_COLOR if isPressed else HOVER_COLOR)
+            self._overlays[key] = overlay
+        position = self._viewport.carrePosition(coord=coord).getPoint()
+        self._screen.blit(self._overlays[key], (position['x'], position['y']))
+
+    def setPointer(self, point: 'Point', isPressed: bool) -> None:
+        coord = self.coordFromScreen(point=point)
+        if coord is None or self._state.isShowAll():
+            self._highlight = {}
+            return
+
+        hiddenTypes = (OfficialCarreType.BLACK, OfficialCarreType.FLAG)
+        if not isPressed or self._state.get(coord=coord) in hiddenTypes:
+            self._highlight = {(coord._coordX, coord._coordY): isPressed}
+            return
+
+        # appui sur une case ouverte : aperçu des voisines que l'accord ouvrirait
+        self._highlight = {
+            (proximityCoord._coordX, proximityCoord._coordY): True
+            for proximityCoord in coord.retrieveProximityCoord(gridWidth=self._state.getWidth(), gridHeight=self._state.getHeight())
+            if self._state.get(coord=proximityCoord) == OfficialCarreType.BLACK
+        }
+
+    def close(self) -> None:
+        self._unsubscribe()
+        pygame.display.quit()
+
+    def _unsubscribe(self) -> None:
+        self._state.unsubscribe(self._changes)
+        self._painter.close()
+        if self._minimap is not None:
+            self._minimap.close()
+
+    def coordFromScreen(self, point: 'Point') -> Optional['Coord']:
+        return self._viewport.coordFromScreen(point=point)
+
+    def scroll(self, dx: int, dy: int) -> None:
+        self._viewport.scroll(dx=dx, dy=dy)
+
+    def zoom(self, step: int, anchor: 'Point') -> None:
+        self._viewport.zoom(step=step, anchor=anchor)
+
+    def centerOnMinimapClick(self, clickPosition: 'Point') -> bool:
+        if self._minimap is None: return False
+        coord = self._minimap.coordFromScreen(point=clickPosition)
+        if coord is None: return False
+
+        self._viewport.centerOn(coord=coord)
+        return True
+
+class TextureRenderer(PygameRenderer):
+    # rendu SDL2 par textures : l'atlas des cases est envoyé une fois, chaque case est une copie de texture
+    # si pygame._sdl2 ou un renderer SDL n'est pas disponible, c'est le rendu logiciel de PygameRenderer
+
+    _accelerated    : int
+    _video          : Optional[Any]
+    _window         : Optional[Any]
+    _sdlRenderer    : Optional[Any]
+    _atlas          : Optional[Any]
+    _atlasRects     : List[Tuple[int, int, int, int]]
+
+    def __init__(self, accelerated: int = -1) -> None:
+        # -1 : le premier renderer disponible, 0 : renderer logiciel, 1 : renderer accéléré
+        super().__init__()
+        self._accelerated   = accelerated
+        self._window        = None
+        self._sdlRenderer   = None
+
+    def _createScreen(self, size: Tuple[int, int]) -> 'Surface':
+        try:
+            from pygame._sdl2 import video
+            os.environ.setdefault('SDL_RENDER_SCALE_QUALITY', '1')
+            self._video         = video
+            self._window        = video.Window("Démineur", size=size)
+            self._sdlRenderer   = video.Renderer(self._window, accelerated=self._accelerated)
+            self._atlas         = video.Texture.from_surface(self._sdlRenderer, self._createAtlas())
+        except (ImportError, RuntimeError, pygame.error):
+            # la fenêtre SDL déjà ouverte ne doit pas rester à côté de celle du rendu logiciel
+            if self._window is not None:
+                self._window.destroy()
+                self._window = None
+            self._sdlRenderer = None
+            return super()._createScreen(size=size)
+
+        # surface hors écran, seulement pour la minimap
+        return Surface(size)
+
+    def _createAtlas(self) -> 'Surface':
+        tileSet     = TILE_SET_CACHE.get(carreSize=PositiveInt(ATLAS_CARRE_SIZE))
+        officialTypes = range(OfficialCarreType.BLACK, 9)
+        atlas       = Surface((len(officialTypes) * ATLAS_CARRE_SIZE, ATLAS_CARRE_SIZE))
+
+        self._atlasRects = []
+        for officialType in officialTypes:
+            x = BoardState.typeToState(officialType) * ATLAS_CARRE_SIZE
+            CarreTile(type=officialType).draw(screen=atlas, position=Point(x=x, y=0), tileSet=tileSet)
+            self._atlasRects.append((x, 0, ATLAS_CARRE_SIZE, ATLAS_CARRE_SIZE))
+        return atlas
+
+    def draw(self) -> None:
+        if self._sdlRenderer is None:
+            super().draw()
+            return
+
+        self._changes.pop()
+        self._sdlRenderer.draw_color = (ByteInt(255), ByteInt(255), ByteInt(255), ByteInt(255))
+        self._sdlRenderer.clear()
+        boardRect = self._viewport.getRect()
+        if self._viewport.isLod():
+            # de loin, une seule image déjà agrandie par LodRenderer
+            self._screen.fill((ByteInt(255), ByteInt(255), ByteInt(255)), boardRect)
+            self._screen.set_clip(boardRect)
+            LOD_RENDERER.draw(screen=self._screen, viewport=self._viewport, state=self._state)
+            self._screen.set_clip(None)
+            self._uploadArea(rect=boardRect)
+        else:
+            self._drawCarres()
+            self._drawHighlight()
+
+        if self._minimap is not None:
+            panel = (boardRect[0] + boardRect[2], boardRect[1], self._screen.get_width() - boardRect[0] - boardRect[2], self._screen.get_height() - boardRect[1])
+            self._screen.fill((ByteInt(255), ByteInt(255), ByteInt(255)), panel)
+            self._minimap.draw(screen=self._screen, viewport=self._viewport)
+            self._uploadArea(rect=panel)
+
+        self._uploadArea(rect=self._drawHud())
+        if self._recorder is not None:
+            # les cases ne sont que des textures : il faut relire toute l'image rendue
+            self._recorder.capture(screen=self._sdlRenderer.to_surface())
+        self._sdlRenderer.present()
+
+    def _uploadArea(self, rect: Tuple[int, int, int, int]) -> None:
+        # les zones dessinées en logiciel sur la surface hors écran sont envoyées en une texture
+        self._video.Texture.from_surface(self._sdlRenderer, self._screen.subsurface(rect)).draw(dstrect=rect)
+
+    def close(self) -> None:
+        if self._sdlRenderer is None:
+            super().close()
+            return
+        self._unsubscribe()
+        self._window.destroy()
+
+    def _drawHighlight(self) -> None:
+        carreSize = self._viewport.getCarreSize()
+        self._sdlRenderer.draw_blend_mode = 1 # SDL_BLENDMODE_BLEND
+        for (coordX, coordY), isPressed in self._highlight.items():
+            position = self._viewport.carrePosition(Coord(coordX=coordX, coordY=coordY)).getPoint()
+            self._sdlRenderer.draw_color = PRESS_COLOR if isPressed else HOVER_COLOR
+            self._sdlRenderer.fill_rect((position['x'], position['y'], carreSize, carreSize))
+        self._sdlRenderer.draw_blend_mode = 0
+
+    def _drawCarres(self) -> None:
+        columns, lines  = self._viewport.visibleRange()
+        if not columns or not lines: return
+
+        carreSize       = self._viewport.getCarreSize()
+        step            = carreSize + self._viewport.getSeparatorSize()
+        origin          = self._viewport.carrePosition(Coord(coordX=columns.start, coordY=lines.start)).getPoint()
+        value, width    = self._state.getValue(), self._state.getWidth()
+        for lineCount, line in enumerate(lines):
+            y = origin['y'] + lineCount * step
+            for columnCount, state in enumerate(value[line * width + columns.start:line * width + columns.stop]):
+                self._atlas.draw(
+                    srcrect=self._atlasRects[state],
+                    dstrect=(origin['x'] + columnCount * step, y, carreSize, carreSize)
+                )
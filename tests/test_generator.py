@@ -0,0 +1,61 @@
+# garde-fous du générateur : le solveur ne se trompe jamais, moveMine garde un schéma bien compté,
+# et une graine donne toujours la même grille (shuffle-v1, noguess-v1)
+import hashlib
+import random
+from demineur.engine import Coord, Grid, addMineCountAtProximity, createMineSchema, moveMine
+from demineur.generator import MINE, OPEN, UNKNOWN, Solver, generateNoGuess
+
+def fingerprint(mineSchema) -> str:
+    return hashlib.sha256(bytes(value + 1 for schemaLine in mineSchema for value in schemaLine)).hexdigest()[:16]
+
+def recount(mineSchema):
+    # schéma recalculé depuis zéro à partir des seules mines
+    width, height = len(mineSchema[0]), len(mineSchema)
+    schema = [[-1 if value == -1 else 0 for value in schemaLine] for schemaLine in mineSchema]
+    addMineCountAtProximity(mineSchema=schema, width=width, height=height)
+    return schema
+
+def test_solver_is_sound():
+    rng = random.Random(0)
+    for _ in range(500):
+        width, height   = rng.randint(5, 16), rng.randint(5, 16)
+        mineCount       = rng.randint(1, width * height // 4)
+        start           = Coord(coordX=rng.randrange(width), coordY=rng.randrange(height))
+        mineSchema      = createMineSchema(width=width, height=height, mineCount=mineCount, rng=rng, excluded=[start._coordY * width + start._coordX])
+        addMineCountAtProximity(mineSchema=mineSchema, width=width, height=height)
+
+        solver  = Solver(mineSchema=mineSchema, mineCount=mineCount)
+        solved  = solver.solve(start=start)
+        mines   = [value == -1 for schemaLine in mineSchema for value in schemaLine]
+        for index, state in enumerate(solver.getKnown()):
+            if state == OPEN: assert not mines[index]
+            if state == MINE: assert mines[index]
+            if solved and state == UNKNOWN: assert mines[index]
+
+def test_move_mine_keeps_counts():
+    rng = random.Random(1)
+    width, height = 12, 9
+    mineSchema = createMineSchema(width=width, height=height, mineCount=30, rng=rng)
+    addMineCountAtProximity(mineSchema=mineSchema, width=width, height=height)
+    for _ in range(300):
+        cells   = [Coord(coordX=x, coordY=y) for y in range(height) for x in range(width)]
+        source  = rng.choice([cell for cell in cells if mineSchema[cell._coordY][cell._coordX] == -1])
+        target  = rng.choice([cell for cell in cells if mineSchema[cell._coordY][cell._coordX] != -1])
+        before  = [schemaLine[:] for schemaLine in mineSchema]
+
+        changed = {(cell._coordX, cell._coordY) for cell in moveMine(mineSchema=mineSchema, width=width, height=height, source=source, target=target)}
+        assert mineSchema == recount(mineSchema)
+        for y in range(height):
+            for x in range(width):
+                if before[y][x] != mineSchema[y][x]: assert (x, y) in changed
+
+def test_shuffle_is_reproducible():
+    grid = Grid(width=30, height=16, mineCount=99, seed=2024)
+    assert fingerprint(grid._mineSchema) == '46693fc4e9e20a2e'
+    assert Grid(width=30, height=16, mineCount=99, seed=2024)._mineSchema == grid._mineSchema
+
+def test_no_guess_is_reproducible_and_solvable():
+    report = generateNoGuess(width=16, height=16, mineCount=40, seed=2024)
+    assert fingerprint(report.getGrid()._mineSchema) == '4cea2026095d0f9e'
+    assert generateNoGuess(width=16, height=16, mineCount=40, seed=2024).getGrid()._mineSchema == report.getGrid()._mineSchema
+    assert Solver(mineSchema=report.getGrid()._mineSchema, mineCount=40).solve(start=report.getStart())
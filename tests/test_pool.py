@@ -0,0 +1,35 @@
+# service de grilles : la fermeture ne bloque jamais, même avec des commandes en attente
+import threading
+import pytest
+from demineur.pool import BoardPool
+
+def closeWithin(pool: 'BoardPool', seconds: float) -> bool:
+    thread = threading.Thread(target=pool.close, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    return not thread.is_alive()
+
+def test_close_with_queued_orders():
+    pool = BoardPool(presets=[(9, 9, 10)], poolSize=3, workers=1, seed=1)
+    pool.get(9, 9, 10, timeout=60)
+    assert closeWithin(pool=pool, seconds=60)
+    with pytest.raises(Exception, match="board pool is closed"):
+        pool.get(9, 9, 10)
+
+def test_close_after_generation_error():
+    pool = BoardPool(presets=[(3, 3, 9)], poolSize=2, workers=1, seed=1)
+    with pytest.raises(Exception, match="too big"):
+        pool.get(3, 3, 9, timeout=60)
+    assert closeWithin(pool=pool, seconds=60)
+
+def test_ready_boards_before_errors():
+    pool = BoardPool(presets=[(9, 9, 10)], poolSize=1, workers=1, seed=1)
+    try:
+        report = pool.get(9, 9, 10, timeout=60)
+        # une grille prête passe avant une erreur déjà reçue
+        with pool._condition:
+            pool._condition.wait_for(lambda: pool._ready[(9, 9, 10)], timeout=60)
+            pool._errors[(9, 9, 10)] = Exception("boom")
+        assert pool.get(9, 9, 10, timeout=60).getGrid()._mineSchema != report.getGrid()._mineSchema
+    finally:
+        assert closeWithin(pool=pool, seconds=60)
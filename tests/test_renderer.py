@@ -0,0 +1,14 @@
+# les rendus fermés ne restent pas abonnés aux changements de la grille
+from demineur.engine import Coord, Grid
+from demineur.renderer import NullRenderer
+
+def test_closed_renderer_unsubscribes():
+    grid = Grid(size=5, mineCount=3, seed=1)
+    renderer = NullRenderer()
+    renderer.open(state=grid.getState())
+    changes = renderer._changes
+    renderer.close()
+
+    grid.toggleFlag(coord=Coord(coordX=0, coordY=0))
+    assert not changes.pop()
+    assert not grid.getState()._subscribers